@@ -0,0 +1,19 @@
+"""Advent of Code 2023 solutions. Day modules do no work at import, each exposes
+INPUT_FP (default puzzle input), SOLVER = (parse, part1, part2) and run_tests()."""
+import importlib
+from types import ModuleType
+from typing import Any, Callable, Tuple, TypeAlias
+
+Solver: TypeAlias = Tuple[Callable[[str], Any], Callable[[Any], int], Callable[[Any], int]]
+DAYS = tuple(range(1, 10))
+
+
+def load_day(day: int) -> ModuleType:
+    # Import lazily so only the requested day pays its import cost
+    if day not in DAYS:
+        raise ValueError(f"No solution for day {day}")
+    return importlib.import_module(f"{__name__}.day{day:02d}")
+
+
+def get_solver(day: int) -> Solver:
+    return load_day(day).SOLVER
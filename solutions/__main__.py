@@ -0,0 +1,67 @@
+import argparse
+import json
+import os
+from contextlib import ExitStack
+from typing import List, Optional
+
+from solutions import DAYS, load_day
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m solutions", description="Run Advent of Code 2023 solutions")
+    parser.add_argument("day", type=int, choices=DAYS)
+    parser.add_argument("--parts", type=int, nargs="+", choices=(1, 2), default=[1, 2])
+    parser.add_argument("--input", help="Input file, defaults to the day's puzzle input")
+    parser.add_argument("--test", action="store_true", help="Run the day's example asserts before solving")
+    parser.add_argument("--cache", action="store_true", help="Reuse cached parses / answers for unchanged inputs")
+    parser.add_argument("--cache-dir", help="Cache location, defaults to $AOC_CACHE_DIR or ~/.cache/aoc2023")
+    parser.add_argument(
+        "--profile", default=os.environ.get("AOC_PROFILE"), help="Write per phase timings / memory as JSON here"
+    )
+    parser.add_argument(
+        "--sample", default=os.environ.get("AOC_PROFILE_SAMPLES"), help="Write sampled collapsed stacks here"
+    )
+    parser.add_argument("--sample-interval", type=float, default=0.005, help="Seconds between stack samples")
+    args = parser.parse_args(argv)
+
+    day = load_day(args.day)
+    if args.profile or args.sample:
+        # Imported here so unprofiled runs don't pay for the instrumentation
+        from solutions import profiling
+    if args.cache:
+        # Imported here so uncached runs don't pay for the cache layer
+        from solutions import cache
+    if args.test:
+        # Before any instrumentation starts, so the asserts don't show up in the profile or samples
+        day.run_tests()
+        if args.profile or args.sample:
+            profiling.run_tests()
+        if args.cache:
+            cache.run_tests()
+    with ExitStack() as profiled:
+        if args.profile or args.sample:
+            profiler = profiling.Profiler()
+            if args.profile:
+                profiled.enter_context(profiling.instrument(args.day, day, profiler))
+            if args.sample:
+                sampler = profiled.enter_context(profiling.StackSampler(args.sample_interval))
+        input_fp = args.input or day.INPUT_FP
+        if args.cache:
+            result_cache = cache.ResultCache(args.cache_dir or cache.DEFAULT_CACHE_DIR)
+            answers = cache.solve_cached(args.day, input_fp, args.parts, result_cache)
+        else:
+            parse, *parts = day.SOLVER
+            parsed_input = parse(input_fp)
+            answers = {part: parts[part - 1](parsed_input) for part in args.parts}
+    for part, answer in answers.items():
+        print(f"Day {args.day:02d} Part {part}: {answer}")
+    if args.profile:
+        with open(args.profile, "w") as profile_file:
+            json.dump({"day": args.day, "input": input_fp, "phases": profiler.to_json()}, profile_file, indent=2)
+    if args.sample:
+        with open(args.sample, "w") as sample_file:
+            sample_file.write("\n".join(sampler.collapsed_stacks()) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Solve many inputs across a process pool, reporting answers as each input finishes.
+
+    python -m solutions.batch 1:inputs/day01 5:inputs/day05/main.txt --workers 16
+
+Inputs are given as DAY:PATH, a directory expands to every .txt file inside it. Line oriented inputs (day01 lines,
+day02 games, day04 cards, day06 races and day09 sequences) are split into chunks solved by separate workers and
+reduced back together. Day03 schematics are streamed through a three row window so tall ones fit in memory, every other
+day is solved whole by a single worker.
+"""
+import argparse
+import math
+import os
+import sys
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeAlias, Union
+
+from solutions import DAYS, get_solver
+from solutions.day01 import calculate_calibration_values
+from solutions.day02 import MAX_COLORS, get_valid_games, min_color_set_powers, parse_game_lines
+from solutions.day03 import sum_streamed_schematic
+from solutions.day04 import cascade_scratchcards, count_winning_points, get_match_counts, load_game_lines
+from solutions.day06 import get_fixed_race_winning_times, get_margin_of_error, load_race_stats
+from solutions.day09 import sum_extrapolated_vals
+from solutions.puzzle_input import get_line_chunks, iter_lines, read_ints
+
+Answers: TypeAlias = Tuple[int, int]
+Task: TypeAlias = Tuple[Callable[..., Any], Tuple[Any, ...]]  # worker function and its (picklable) arguments
+DEFAULT_CHUNK_BYTES = 1 << 24
+
+
+def solve_whole(day: int, input_fp: str) -> Answers:
+    parse, part1, part2 = get_solver(day)
+    parsed_input = parse(input_fp)
+    return part1(parsed_input), part2(parsed_input)
+
+
+def solve_day01_chunk(input_fp: str, start: int, stop: int) -> Answers:
+    lines = [line.decode() for line in iter_lines(input_fp, start, stop)]
+    return sum(calculate_calibration_values(lines)), sum(calculate_calibration_values(lines, False))
+
+
+def solve_day02_chunk(input_fp: str, start: int, stop: int) -> Tuple[int, int, int, int]:
+    # Game ids are line numbers, so return enough to shift this chunk's local ids once earlier chunks are counted
+    min_colors = parse_game_lines(iter_lines(input_fp, start, stop))
+    valid_games = get_valid_games(min_colors, MAX_COLORS)
+    return len(min_colors[0]), len(valid_games), sum(valid_games), sum(min_color_set_powers(min_colors))
+
+
+def solve_day04_chunk(input_fp: str, start: int, stop: int) -> Tuple[int, array]:
+    # Card copies cascade across chunk boundaries, so only the match counts come back for part 2
+    games = load_game_lines(iter_lines(input_fp, start, stop))
+    return sum(count_winning_points(games)), get_match_counts(games)
+
+
+def solve_day06_chunk(race_stats: List[Tuple[int, int]]) -> int:
+    return get_margin_of_error(race_stats)
+
+
+def solve_day06_fixed_race(input_fp: str) -> int:
+    return get_fixed_race_winning_times(load_race_stats(input_fp))
+
+
+def solve_day09_chunk(input_fp: str, start: int, stop: int) -> Answers:
+    sequences = [read_ints(line) for line in iter_lines(input_fp, start, stop)]
+    return sum_extrapolated_vals(sequences), sum_extrapolated_vals(sequences, False)
+
+
+def reduce_day02(chunk_results: List[Tuple[int, int, int, int]]) -> Answers:
+    part1, part2, games_seen = 0, 0, 0
+    for num_games, num_valid, local_id_sum, power_sum in chunk_results:
+        part1 += local_id_sum + games_seen * num_valid
+        part2 += power_sum
+        games_seen += num_games
+    return part1, part2
+
+
+def reduce_day04(chunk_results: List[Tuple[int, array]]) -> Answers:
+    match_counts = array("I")
+    for _, chunk_match_counts in chunk_results:
+        match_counts.extend(chunk_match_counts)
+    return sum(points for points, _ in chunk_results), cascade_scratchcards(match_counts)
+
+
+def reduce_sums(chunk_results: List[Answers]) -> Answers:
+    return sum(part1 for part1, _ in chunk_results), sum(part2 for _, part2 in chunk_results)
+
+
+LINE_CHUNK_SOLVERS: Dict[int, Tuple[Callable[..., Any], Callable[[List[Any]], Answers]]] = {
+    1: (solve_day01_chunk, reduce_sums),
+    2: (solve_day02_chunk, reduce_day02),
+    4: (solve_day04_chunk, reduce_day04),
+    9: (solve_day09_chunk, reduce_sums),
+}
+
+
+def get_tasks(day: int, input_fp: str, chunk_bytes: int) -> Tuple[List[Task], Callable[[List[Any]], Answers]]:
+    if day in LINE_CHUNK_SOLVERS:
+        solve_chunk, reduce_chunks = LINE_CHUNK_SOLVERS[day]
+        chunks = get_line_chunks(input_fp, chunk_bytes)
+        return [(solve_chunk, (input_fp, start, stop)) for start, stop in chunks], reduce_chunks
+    if day == 6:
+        # Races are columns rather than lines, chunk the parsed races. Part 2 is a single race, solved on its own
+        race_stats = load_race_stats(input_fp)
+        races_per_chunk = max(1, chunk_bytes // 16)  # roughly the bytes a race takes across both lines
+        tasks: List[Task] = [
+            (solve_day06_chunk, (race_stats[k : k + races_per_chunk],))
+            for k in range(0, len(race_stats), races_per_chunk)
+        ]
+        return tasks + [(solve_day06_fixed_race, (input_fp,))], lambda results: (math.prod(results[:-1]), results[-1])
+    if day == 3:
+        return [(sum_streamed_schematic, (input_fp,))], lambda results: results[0]
+    return [(solve_whole, (day, input_fp))], lambda results: results[0]
+
+
+def solve_chunked(day: int, input_fp: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Answers:
+    """Run an input's tasks in process, what run_batch computes for it without the pool"""
+    tasks, reduce_results = get_tasks(day, input_fp, chunk_bytes)
+    return reduce_results([func(*args) for func, args in tasks])
+
+
+def expand_inputs(input_specs: List[str]) -> List[Tuple[int, str]]:
+    day_inputs: List[Tuple[int, str]] = []
+    for spec in input_specs:
+        day, input_path = spec.split(":", 1)
+        if os.path.isdir(input_path):
+            input_names = sorted(name for name in os.listdir(input_path) if name.endswith(".txt"))
+            input_fps = [os.path.join(input_path, name) for name in input_names]
+        else:
+            input_fps = [input_path]
+        day_inputs.extend((int(day), input_fp) for input_fp in input_fps)
+    return day_inputs
+
+
+def run_batch(
+    day_inputs: List[Tuple[int, str]], workers: Optional[int] = None, chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> Iterator[Tuple[int, str, Union[Answers, Exception]]]:
+    """Fan every input (and chunk) out over a process pool, yielding (day, input, answers) as inputs complete. An
+    input that fails yields its exception in place of answers, the rest of the batch carries on"""
+    with ProcessPoolExecutor(workers) as pool:
+        futures: Dict[Future, Tuple[int, int]] = {}
+        chunk_results: List[List[Any]] = []
+        reducers: List[Callable[[List[Any]], Answers]] = []
+        remaining: List[int] = []
+        for input_ix, (day, input_fp) in enumerate(day_inputs):
+            try:
+                tasks, reduce_results = get_tasks(day, input_fp, chunk_bytes)
+            except Exception as exc:
+                yield day, input_fp, exc
+                tasks, reduce_results = [], reduce_sums
+            chunk_results.append([None] * len(tasks))
+            reducers.append(reduce_results)
+            remaining.append(len(tasks))
+            for task_ix, (func, args) in enumerate(tasks):
+                futures[pool.submit(func, *args)] = (input_ix, task_ix)
+        for future in as_completed(futures):
+            input_ix, task_ix = futures.pop(future)
+            if remaining[input_ix] < 0:
+                continue  # an earlier chunk of this input failed and was already reported
+            day, input_fp = day_inputs[input_ix]
+            try:
+                chunk_results[input_ix][task_ix] = future.result()
+                remaining[input_ix] -= 1
+                answers = reducers[input_ix](chunk_results[input_ix]) if not remaining[input_ix] else None
+            except Exception as exc:
+                remaining[input_ix], chunk_results[input_ix] = -1, []
+                yield day, input_fp, exc
+                continue
+            if answers is not None:
+                yield day, input_fp, answers
+                chunk_results[input_ix] = []
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m solutions.batch", description=__doc__.split("\n")[0])
+    parser.add_argument("inputs", nargs="+", metavar="DAY:PATH", help="Input file or directory of inputs for a day")
+    parser.add_argument("--workers", type=int, help="Worker processes, defaults to the number of CPUs")
+    parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES, help="Target size of input chunks")
+    parser.add_argument("--test", action="store_true", help="Check chunked answers against whole runs first")
+    args = parser.parse_args(argv)
+
+    if args.test:
+        run_tests()
+    day_inputs = expand_inputs(args.inputs)
+    for day, _ in day_inputs:
+        if day not in DAYS:
+            parser.error(f"No solution for day {day}")
+    num_failed = 0
+    for day, input_fp, answers in run_batch(day_inputs, args.workers, args.chunk_bytes):
+        if isinstance(answers, Exception):
+            num_failed += 1
+            print(f"Day {day:02d} {input_fp}: Error - {type(answers).__name__}: {answers}", file=sys.stderr, flush=True)
+        else:
+            print(f"Day {day:02d} {input_fp}: Part 1 - {answers[0]}, Part 2 - {answers[1]}", flush=True)
+    if num_failed:
+        sys.exit(f"{num_failed} of {len(day_inputs)} inputs failed")
+
+
+def run_tests() -> None:
+    # Chunk boundaries must not change answers, even with every line in its own chunk
+    test_inputs = [
+        (1, "inputs/day01/day01_test.txt"),
+        (2, "inputs/day02/day02_test.txt"),
+        (3, "inputs/day03/test.txt"),
+        (4, "inputs/day04/test.txt"),
+        (6, "inputs/day06/test.txt"),
+        (9, "inputs/day09/test.txt"),
+    ]
+    for day, input_fp in test_inputs:
+        for chunk_bytes in (1, 64, DEFAULT_CHUNK_BYTES):
+            assert solve_chunked(day, input_fp, chunk_bytes) == solve_whole(day, input_fp), (day, chunk_bytes)
+    assert reduce_day02([(2, 1, 2, 10), (3, 2, 4, 20)]) == (2 + 4 + 2 * 2, 30)  # 2nd chunk's ids shift by 2 games
+    assert reduce_day04([(3, array("I", [1, 0])), (1, array("I", [0]))]) == (4, 4)
+    # A failing input is reported on its own without losing the others
+    results = {input_fp: answers for _, input_fp, answers in run_batch(test_inputs[:2] + [(2, "missing.txt")], 2, 64)}
+    assert results["inputs/day02/day02_test.txt"] == solve_whole(2, "inputs/day02/day02_test.txt")
+    assert isinstance(results["missing.txt"], FileNotFoundError)
+
+
+if __name__ == "__main__":
+    main()
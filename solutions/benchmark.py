@@ -0,0 +1,102 @@
+"""Benchmark every day's parse and solve phases on generated inputs of increasing scale, writing JSON results.
+
+    python -m solutions.benchmark --days 1 5 --scales 1000 100000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from solutions import DAYS, get_solver
+from solutions.generators import MAX_SCALES, generate_input
+
+DEFAULT_SCALES = [10**3, 10**4, 10**5]
+
+
+def time_call(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def get_peak_memory(func: Callable[..., Any], *args: Any) -> int:
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_day(day: int, scale: int, seed: int = 2023, track_memory: bool = True) -> Dict[str, Any]:
+    text, answers = generate_input(day, scale, seed)
+    parse, *parts = get_solver(day)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_fp = os.path.join(tmp_dir, "input.txt")
+        with open(input_fp, "w") as input_file:
+            input_file.write(text)
+        num_lines = text.count("\n") + 1
+        parsed_input, parse_time = time_call(parse, input_fp)
+        result: Dict[str, Any] = {
+            "day": day,
+            "scale": min(scale, MAX_SCALES.get(day, scale)),
+            "requested_scale": scale,
+            "lines": num_lines,
+            "bytes": len(text),
+            "parse_s": parse_time,
+            "parse_peak_bytes": get_peak_memory(parse, input_fp) if track_memory else None,
+        }
+        for part_no, solve in enumerate(parts, start=1):
+            answer, solve_time = time_call(solve, parsed_input)
+            result[f"part{part_no}"] = {
+                "solve_s": solve_time,
+                "lines_per_s": num_lines / (parse_time + solve_time) if parse_time + solve_time else None,
+                "peak_bytes": get_peak_memory(solve, parsed_input) if track_memory else None,
+                "correct": answer == answers[part_no - 1],
+            }
+    return result
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m solutions.benchmark", description=__doc__.split("\n")[0])
+    parser.add_argument("--days", type=int, nargs="+", choices=DAYS, default=list(DAYS))
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--seed", type=int, default=2023)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory passes")
+    parser.add_argument("--output", help="JSON results path, defaults to stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    for day in args.days:
+        for scale in args.scales:
+            results.append(benchmark_day(day, scale, args.seed, track_memory=not args.no_memory))
+            print(f"Day {day:02d} scale {scale} done", file=sys.stderr)
+    report = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Content addressed cache for parsed inputs and answers. Entries are keyed by the input's hash and a hash of the
+day's solver code, so editing a solver invalidates its entries. A small in-memory LRU sits in front of compressed
+pickles on disk, and the disk tier evicts its least recently used entries once it outgrows its size limit."""
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from solutions import load_day
+from solutions.puzzle_input import map_input
+
+DEFAULT_CACHE_DIR = os.environ.get("AOC_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "aoc2023"))
+CACHE_SUFFIX = ".pkl.z"
+MISSING = object()
+
+
+def get_input_digest(input_fp: str) -> str:
+    with map_input(input_fp) as mapped_input:
+        return hashlib.sha256(mapped_input).hexdigest()
+
+
+def get_solver_version(day: int) -> str:
+    # Hash of the day's source along with the shared input layer it parses with
+    version = hashlib.sha256()
+    for module_fp in (load_day(day).__file__, os.path.join(os.path.dirname(__file__), "puzzle_input.py")):
+        with open(str(module_fp), "rb") as module_file:
+            version.update(module_file.read())
+    return version.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_disk_bytes: int = 1 << 30, max_memory_entries: int = 32):
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_entries = max_memory_entries
+        self.memory: OrderedDict[str, Any] = OrderedDict()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name + CACHE_SUFFIX)
+
+    def _remember(self, name: str, value: Any) -> None:
+        self.memory[name] = value
+        self.memory.move_to_end(name)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, name: str) -> Any:
+        if name in self.memory:
+            self.memory.move_to_end(name)
+            return self.memory[name]
+        try:
+            with open(self._path(name), "rb") as cache_file:
+                value = pickle.loads(zlib.decompress(cache_file.read()))
+            os.utime(self._path(name))  # mtime doubles as last access time for eviction
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+            return MISSING
+        self._remember(name, value)
+        return value
+
+    def put(self, name: str, value: Any) -> None:
+        tmp_path = self._path(name) + f".{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as cache_file:
+            cache_file.write(zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+        os.replace(tmp_path, self._path(name))
+        self._remember(name, value)
+        self.evict()
+
+    def _entries(self) -> List[Tuple[str, os.stat_result]]:
+        # Other processes sharing the cache dir may remove entries at any point, skip any that are already gone
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(CACHE_SUFFIX):
+                try:
+                    entries.append((entry.name, entry.stat()))
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    def _unlink(self, name: str) -> None:
+        try:
+            os.unlink(os.path.join(self.cache_dir, name))
+        except FileNotFoundError:
+            pass
+
+    def invalidate(self, prefix: str, keep_prefix: str) -> None:
+        """Drop entries starting with prefix unless they start with keep_prefix, e.g. older solver versions"""
+        for name, _ in self._entries():
+            if name.startswith(prefix) and not name.startswith(keep_prefix):
+                self._unlink(name)
+
+    def evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        total_bytes = sum(stat.st_size for _, stat in entries)
+        for name, stat in entries:
+            if total_bytes <= self.max_disk_bytes:
+                break
+            total_bytes -= stat.st_size
+            self._unlink(name)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        for name, _ in self._entries():
+            self._unlink(name)
+
+
+def solve_cached(day: int, input_fp: str, parts: Iterable[int], cache: ResultCache) -> Dict[int, int]:
+    """Answers for the requested parts, only parsing / solving what the cache can't answer"""
+    parse, *solvers = load_day(day).SOLVER
+    input_prefix = f"day{day:02d}_{get_input_digest(input_fp)}_"
+    version_prefix = f"{input_prefix}{get_solver_version(day)}_"
+    answers = {}
+    parsed_input = MISSING
+    for part in parts:
+        answer_name = f"{version_prefix}part{part}"
+        answers[part] = cache.get(answer_name)
+        if answers[part] is MISSING:
+            if parsed_input is MISSING:
+                parsed_input = cache.get(f"{version_prefix}parsed")
+                if parsed_input is MISSING:
+                    cache.invalidate(input_prefix, keep_prefix=version_prefix)
+                    parsed_input = parse(input_fp)
+                    cache.put(f"{version_prefix}parsed", parsed_input)
+            answers[part] = solvers[part - 1](parsed_input)
+            cache.put(answer_name, answers[part])
+    return answers
+
+
+def run_tests() -> None:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ResultCache(cache_dir, max_disk_bytes=0, max_memory_entries=1)
+        cache.put("a", 1)
+        # Over the disk limit, so the entry is evicted from disk but still served from memory
+        assert cache._entries() == [] and cache.get("a") == 1
+        # The least recently used entry goes first once the disk tier is over its limit
+        cache.max_disk_bytes = 1 << 30
+        cache.put("old", 0)
+        cache.put("new", 0)
+        os.utime(cache._path("old"), (0, 0))
+        cache.max_disk_bytes = os.path.getsize(cache._path("new"))
+        cache.evict()
+        assert [name for name, _ in cache._entries()] == ["new" + CACHE_SUFFIX]
+        cache.clear()
+        cache = ResultCache(cache_dir, max_memory_entries=1)
+        for name in ("day01_x_old_part1", "day01_x_new_part1", "day01_y_old_part1"):
+            cache.put(name, name)
+        cache.invalidate("day01_x_", keep_prefix="day01_x_new_")
+        assert sorted(name for name, _ in cache._entries()) == [
+            f"day01_x_new_part1{CACHE_SUFFIX}",
+            f"day01_y_old_part1{CACHE_SUFFIX}",
+        ]
+        assert cache.get("day01_x_old_part1") is MISSING and cache.get("day01_y_old_part1") == "day01_y_old_part1"
+        # Entries removed by another process under us are skipped rather than raising
+        other = ResultCache(cache_dir)
+        other.clear()
+        cache._unlink("day01_x_new_part1" + CACHE_SUFFIX)
+        cache.evict()
+        cache.invalidate("day01_", keep_prefix="day02_")
+        assert cache._entries() == [] and cache.get("day01_x_new_part1") is MISSING
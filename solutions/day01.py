@@ -1,4 +1,7 @@
-from typing import List
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple, TypeAlias
+
+from solutions.puzzle_input import iter_lines
 
 DIGIT_MAP = {
     "one": "1",
@@ -12,44 +15,115 @@ DIGIT_MAP = {
     "nine": "9",
 }
 
+# Aho-Corasick automaton flattened to a DFA: (per state transitions, per state matched digit value or NO_MATCH)
+DigitAutomaton: TypeAlias = Tuple[List[Dict[str, int]], List[int]]
+NO_MATCH = -1  # "0" is a digit too, so no match can't be falsy
+
+
+def build_digit_automaton(patterns: Dict[str, int]) -> DigitAutomaton:
+    """Compile patterns into a DFA whose states report the digit value of any pattern ending there"""
+    transitions: List[Dict[str, int]] = [{}]
+    outputs = [NO_MATCH]
+    for pattern, value in patterns.items():
+        state = 0
+        for char in pattern:
+            if char not in transitions[state]:
+                transitions.append({})
+                outputs.append(NO_MATCH)
+                transitions[state][char] = len(transitions) - 1
+            state = transitions[state][char]
+        outputs[state] = value
+    # BFS over the trie to resolve failure links into full transitions, so scanning is one dict lookup per char
+    alphabet = {char for pattern in patterns for char in pattern}
+    failure = [0] * len(transitions)
+    queue = deque(transitions[0].values())
+    while queue:
+        state = queue.popleft()
+        if outputs[state] == NO_MATCH:
+            outputs[state] = outputs[failure[state]]
+        for char in alphabet:
+            if char in transitions[state]:
+                child = transitions[state][char]
+                failure[child] = transitions[failure[state]].get(char, 0) if state else 0
+                queue.append(child)
+            elif state:
+                transitions[state][char] = transitions[failure[state]].get(char, 0)
+    return transitions, outputs
+
+
+EXPLICIT_DIGITS = {str(d): d for d in range(10)}
+SPELLED_DIGITS = EXPLICIT_DIGITS | {word: int(digit) for word, digit in DIGIT_MAP.items()}
+# Forward automata find the first digit, reversed pattern automata scan lines backwards for the last digit.
+# No digit word contains another, so the first match to end is also the first to start.
+AUTOMATA = {
+    True: (build_digit_automaton(EXPLICIT_DIGITS), build_digit_automaton(EXPLICIT_DIGITS)),
+    False: (
+        build_digit_automaton(SPELLED_DIGITS),
+        build_digit_automaton({pattern[::-1]: val for pattern, val in SPELLED_DIGITS.items()}),
+    ),
+}
+
 
 def read_calibration_lines(docuemnt_path: str) -> List[str]:
-    return open(docuemnt_path).read().split("\n")
+    return list(iter_calibration_lines(docuemnt_path))
+
+
+def iter_calibration_lines(document_path: str) -> Iterator[str]:
+    """Lazily yield calibration lines from the memory-mapped document"""
+    return (line.decode() for line in iter_lines(document_path))
+
+
+def scan_first_digit(chars: Iterable[str], automaton: DigitAutomaton) -> int:
+    transitions, outputs = automaton
+    state = 0
+    for char in chars:
+        state = transitions[state].get(char, 0)
+        if outputs[state] != NO_MATCH:
+            return outputs[state]
+    raise ValueError("Calibration line contains no digits")
+
+
+def get_calibration_value(calibration_line: str, use_explicit_digits_only: bool) -> int:
+    forward_automaton, backward_automaton = AUTOMATA[use_explicit_digits_only]
+    first_digit = scan_first_digit(calibration_line, forward_automaton)
+    return 10 * first_digit + scan_first_digit(reversed(calibration_line), backward_automaton)
+
+
+def calculate_calibration_values(
+    calibration_document: Iterable[str], use_explicit_digits_only: bool = True
+) -> List[int]:
+    return [get_calibration_value(line, use_explicit_digits_only) for line in calibration_document]
+
 
+def sum_calibration_values(document_path: str, use_explicit_digits_only: bool = True) -> int:
+    # Streaming mode: never materialise every line / calibration value
+    lines = iter_calibration_lines(document_path)
+    return sum(get_calibration_value(line, use_explicit_digits_only) for line in lines)
 
-def strip_calibration_line(calibration_line: str, use_explicit_digits_only: bool) -> str:
-    """Remove non-numeric strings from calibration, optionally replace spelled out digits with value"""
-    translation_dictionary = {"": ""} if use_explicit_digits_only else DIGIT_MAP
-    for key, val in translation_dictionary.items():
-        # replace spelled out digit with value, padded by spelled out version in case of letter overlap
-        # e.g. eightwothree
-        calibration_line = calibration_line.replace(key, f"{key}{val}{key}")
-    return "".join(char for char in calibration_line if char.isdigit())
 
+def sum_part1(calibration_document: List[str]) -> int:
+    return sum(calculate_calibration_values(calibration_document))
 
-def calculate_calibration_values(calibration_document: List[str], use_explicit_digits_only: bool = True) -> List[int]:
-    stripped_values = [strip_calibration_line(line, use_explicit_digits_only) for line in calibration_document]
-    return [int(f"{val[0]}{val[-1]}") for val in stripped_values]
 
+def sum_part2(calibration_document: List[str]) -> int:
+    return sum(calculate_calibration_values(calibration_document, use_explicit_digits_only=False))
 
-# Tests
-test_document = read_calibration_lines("inputs/day01/day01_test.txt")
-test_calibration_vals = calculate_calibration_values(test_document)
-assert test_calibration_vals == [12, 38, 15, 77]
-assert sum(test_calibration_vals) == 142
 
-test_document2 = read_calibration_lines("inputs/day01/day01_test2.txt")
-test_calibration_vals2 = calculate_calibration_values(test_document2, use_explicit_digits_only=False)
-assert test_calibration_vals2 == [29, 83, 13, 24, 42, 14, 76]
-assert sum(test_calibration_vals2) == 281
+INPUT_FP = "inputs/day01/day01.txt"
+SOLVER = (read_calibration_lines, sum_part1, sum_part2)
 
 
-# Part 1
-calibration_document = read_calibration_lines("inputs/day01/day01.txt")
-calibration_values = calculate_calibration_values(calibration_document)
-print(f"PART 1: Sum of Calibration Values - {sum(calibration_values)}")
+def run_tests() -> None:
+    test_document = read_calibration_lines("inputs/day01/day01_test.txt")
+    test_calibration_vals = calculate_calibration_values(test_document)
+    assert test_calibration_vals == [12, 38, 15, 77]
+    assert sum(test_calibration_vals) == 142
+    assert sum_calibration_values("inputs/day01/day01_test.txt") == 142
 
-# Part 2
-calibration_document2 = read_calibration_lines("inputs/day01/day01.txt")
-calibration_values2 = calculate_calibration_values(calibration_document2, use_explicit_digits_only=False)
-print(f"PART 2: Sum of Calibration Values - {sum(calibration_values2)}")
+    test_document2 = read_calibration_lines("inputs/day01/day01_test2.txt")
+    test_calibration_vals2 = calculate_calibration_values(test_document2, use_explicit_digits_only=False)
+    assert test_calibration_vals2 == [29, 83, 13, 24, 42, 14, 76]
+    assert sum(test_calibration_vals2) == 281
+    assert sum_calibration_values("inputs/day01/day01_test2.txt", use_explicit_digits_only=False) == 281
+    assert calculate_calibration_values(["9nine40p", "0b"]) == [90, 0]
+    assert calculate_calibration_values(["9nine40p", "zero0two"], use_explicit_digits_only=False) == [90, 2]
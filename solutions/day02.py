@@ -1,53 +1,79 @@
-from typing import Dict, List, Tuple, TypeAlias
+from array import array
+from typing import Iterable, List, Sequence, Tuple, TypeAlias
+
+from solutions.puzzle_input import iter_lines
 
 RGBCounts: TypeAlias = Tuple[int, int, int]
+COLORS = ("red", "green", "blue")
+MAX_COLORS: RGBCounts = (12, 13, 14)
+COLOR_IXS = {color.encode(): color_ix for color_ix, color in enumerate(COLORS)}
+MinColors: TypeAlias = Tuple[array, array, array]  # Per color column of min cubes needed, index = game id - 1
+
+
+def parse_game_results(input_path: str) -> MinColors:
+    return parse_game_lines(iter_lines(input_path))
+
+
+def parse_game_lines(game_lines: Iterable[bytes]) -> MinColors:
+    # Both parts only need each color's max over a game's rounds, so reduce every line as it's read. Line index
+    # tracks game no.
+    min_colors: MinColors = (array("I"), array("I"), array("I"))
+    for line in game_lines:
+        # After the "Game n:" header, whitespace tokens alternate between cube counts and (punctuated) colors
+        tokens = line.split()
+        if len(tokens) < 4 or len(tokens) % 2 or tokens[0] != b"Game" or not tokens[1].endswith(b":"):
+            raise ValueError(f"Malformed game line {line!r}")
+        game_maxes = [0, 0, 0]
+        for num_cube, color in zip(tokens[2::2], tokens[3::2]):
+            color_ix = COLOR_IXS.get(color.rstrip(b",;"))
+            if color_ix is None:
+                raise ValueError(f"Unknown cube color {color!r}")
+            count = int(num_cube)
+            if count > game_maxes[color_ix]:
+                game_maxes[color_ix] = count
+        for min_counts, count in zip(min_colors, game_maxes):
+            min_counts.append(count)
+    return min_colors
 
 
-def parse_game_results(input_path: str) -> List[List[str]]:
-    # Split each line by Game delimiter, ": ", then by round set delimiter "; ". List index will track game no.
-    return [line.split(": ")[1].split("; ") for line in open(input_path).read().split("\n")]
+def get_valid_games_per_config(min_colors: MinColors, max_colors_batch: Sequence[RGBCounts]) -> List[List[int]]:
+    """Check every bag configuration against the same game log in a single pass over the games"""
+    valid_games: List[List[int]] = [[] for _ in max_colors_batch]
+    for game_ix, (min_r, min_g, min_b) in enumerate(zip(*min_colors)):
+        for config_games, (max_r, max_g, max_b) in zip(valid_games, max_colors_batch):
+            if min_r <= max_r and min_g <= max_g and min_b <= max_b:
+                config_games.append(game_ix + 1)
+    return valid_games
 
 
-def is_valid_game(seen_min_counts: RGBCounts, game_max_counts: RGBCounts) -> bool:
-    return all(seen_min_counts[k] <= game_max_counts[k] for k in range(3))
+def get_valid_games(min_colors: MinColors, max_colors: RGBCounts) -> List[int]:
+    return get_valid_games_per_config(min_colors, [max_colors])[0]
 
 
-def get_min_colors_per_game(game_results: List[List[str]]) -> Dict[int, RGBCounts]:
-    min_count_dict = {}
-    for k, game in enumerate(game_results):
-        min_r, min_g, min_b = 0, 0, 0
-        for round in game:
-            for color in round.split(", "):
-                match color.split(" "):
-                    case [num_cube, "red"]:
-                        min_r = max(min_r, int(num_cube))
-                    case [num_cube, "green"]:
-                        min_g = max(min_g, int(num_cube))
-                    case [num_cube, "blue"]:
-                        min_b = max(min_b, int(num_cube))
-        min_count_dict[k + 1] = (min_r, min_g, min_b)
-    return min_count_dict
+def min_color_set_powers(min_colors: MinColors) -> List[int]:
+    return [min_r * min_g * min_b for min_r, min_g, min_b in zip(*min_colors)]
 
 
-def get_valid_games(min_colors: Dict[int, RGBCounts], max_colors: RGBCounts) -> List[int]:
-    return [key for key, val in min_colors.items() if is_valid_game(val, max_colors)]
+def sum_valid_game_ids(min_colors: MinColors, max_colors: RGBCounts = MAX_COLORS) -> int:
+    return sum(get_valid_games(min_colors, max_colors))
 
 
-def min_color_set_power(min_counts: RGBCounts) -> int:
-    return min_counts[0] * min_counts[1] * min_counts[2]
+def sum_game_set_powers(min_colors: MinColors) -> int:
+    return sum(min_color_set_powers(min_colors))
 
 
-# Tests
-test_game = parse_game_results("inputs/day02/day02_test.txt")
-test_maxes: RGBCounts = (12, 13, 14)
-test_min_colors = get_min_colors_per_game(test_game)
-assert get_valid_games(test_min_colors, test_maxes) == [1, 2, 5]
-assert [min_color_set_power(val) for val in test_min_colors.values()] == [48, 12, 1560, 630, 36]
+INPUT_FP = "inputs/day02/day02.txt"
+SOLVER = (parse_game_results, sum_valid_game_ids, sum_game_set_powers)
 
 
-# Part 1
-game_results = parse_game_results("inputs/day02/day02.txt")
-maxes: RGBCounts = (12, 13, 14)
-min_colors = get_min_colors_per_game(game_results)
-print(f"Part 1: The sum of the IDs of valid games is - {sum(get_valid_games(min_colors, maxes))}")
-print(f"Part 2: Sum of the all game set powers - {sum(min_color_set_power(min_c) for min_c in min_colors.values())}")
+def run_tests() -> None:
+    test_min_colors = parse_game_results("inputs/day02/day02_test.txt")
+    assert get_valid_games(test_min_colors, MAX_COLORS) == [1, 2, 5]
+    assert get_valid_games_per_config(test_min_colors, [MAX_COLORS, (20, 13, 14)]) == [[1, 2, 5], [1, 2, 3, 5]]
+    assert min_color_set_powers(test_min_colors) == [48, 12, 1560, 630, 36]
+    for bad_line in (b"garbage", b"Game 1: 3 black", b"Game 1:"):
+        try:
+            parse_game_lines([bad_line])
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad_line!r} should not parse")
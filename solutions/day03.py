@@ -1,71 +1,143 @@
-from functools import reduce
-from typing import List, Literal, Set, Tuple, TypeAlias
+import re
+from array import array
+from bisect import bisect_right
+from itertools import chain
+from typing import Iterable, Iterator, List, Literal, Tuple, TypeAlias
+
+from solutions.puzzle_input import iter_lines
 
 Schematic: TypeAlias = List[str]
+Grid: TypeAlias = List[bytes]  # uint8 grid, one bytes row per schematic row
+NumberRuns: TypeAlias = Tuple[array, List[Tuple[int, int, int, int]]]  # (cell labels, (row, start, end, value))
+ScannedRow: TypeAlias = Tuple[bytes, int, List[int], List[Tuple[int, int, int]]]  # (row, symbol mask, starts, runs)
+
+NUMBER_PATTERN = re.compile(rb"\d+")
+GEAR_PATTERN = re.compile(rb"\*")
+SYMBOL_TABLE = bytes(int(b not in b".0123456789") for b in range(256))  # translate table, 1 where symbol
 
 
 def parse_schematic(input_fp: str) -> Schematic:
-    return open(input_fp).read().split("\n")
+    return [row.decode() for row in iter_lines(input_fp)]
+
+
+def load_grid(schematic: Schematic) -> Grid:
+    return [row.encode() for row in schematic]
+
+
+def dilate_row_symbols(row: bytes) -> int:
+    # Big int with one byte lane per cell, so shifting by 8 bits moves one column
+    symbols = int.from_bytes(row.translate(SYMBOL_TABLE), "big")
+    return (symbols | (symbols << 8) | (symbols >> 8)) & ((1 << (8 * len(row))) - 1)
 
 
-def generate_grid_neighbors(row_ix: int, col_ix: int, num_rows: int, num_cols: int) -> Set[Tuple[int, int]]:
-    plus_mins = {-1, 0, 1}
-    possible_directions = [
-        (min(num_cols - 1, max(0, row_ix + dx)), min(num_cols - 1, max(0, col_ix + dy)))
-        for dx in plus_mins
-        for dy in plus_mins
-    ]
-    return set(possible_directions).difference({(row_ix, col_ix)})
+def get_symbol_adjacency_mask(grid: Grid) -> Grid:
+    """Dilate the symbol mask by one cell in every direction, 1 where a cell touches a symbol"""
+    N, M = len(grid), len(grid[0])
+    row_masks = [0] + [dilate_row_symbols(row) for row in grid] + [0]
+    return [(row_masks[k] | row_masks[k + 1] | row_masks[k + 2]).to_bytes(M, "big") for k in range(N)]
 
 
-def symbol_check(symbol: str) -> bool:
-    return symbol != "." and not symbol.isdigit()
+def label_number_runs(grid: Grid) -> NumberRuns:
+    # Label every digit cell with the 1-based index of the number it belongs to, 0 elsewhere
+    M = len(grid[0])
+    labels = array("I", [0]) * (len(grid) * M)
+    runs = []
+    for row_ix, row in enumerate(grid):
+        for match in NUMBER_PATTERN.finditer(row):
+            runs.append((row_ix, match.start(), match.end(), int(match.group())))
+            offset = row_ix * M
+            labels[offset + match.start() : offset + match.end()] = array("I", [len(runs)]) * len(match.group())
+    return labels, runs
 
 
 def implement_schematic(
     schematic: Schematic, return_type: Literal["part_nos", "gear_ratios"] = "part_nos"
 ) -> List[int]:
-    N, M = len(schematic), len(schematic[0])  # num rows and cols
-    # Parse grid postions of all integers
-    part_nos = []
-    part_pos_dict = {}
-    gear_ratio_pos = []
-    for row_ix, row in enumerate(schematic):
-        cur_int = ""
-        cur_positions = []
-        for col_ix, chr in enumerate(row):
-            if chr.isdigit():
-                cur_int += chr
-                cur_positions.append((row_ix, col_ix))
-            if cur_int and (col_ix == M - 1 or not chr.isdigit()):
-                # case we have found full integer
-                neighbors = reduce(set.union, [generate_grid_neighbors(pos[0], pos[1], N, M) for pos in cur_positions])
-                if any(symbol_check(schematic[nbr[0]][nbr[1]]) for nbr in neighbors):
-                    part_nos.append(int(cur_int))
-                    # keep track of individual digit positions and their corresponding part no
-                    #  / all digit positions in the integer.
-                    part_pos_dict = part_pos_dict | {pos: (tuple(cur_positions), int(cur_int)) for pos in cur_positions}
-                cur_int = ""
-                cur_positions = []
-            if chr == "*" and return_type == "gear_ratios":
-                neighbors = generate_grid_neighbors(row_ix, col_ix, N, M)
-                # record all neigbors of gear that are a digit, hence that digit belongs to a
-                # part no (since "*"" is a symbol != "."). Will use part_pos_dict to get unique part neighbors
-                gear_ratio_pos.append([nbr for nbr in neighbors if schematic[nbr[0]][nbr[1]].isdigit()])
+    grid = load_grid(schematic)
+    N, M = len(grid), len(grid[0])  # num rows and cols
     if return_type == "part_nos":
-        return part_nos
-    else:
-        # dedupe gear digit neighbors
-        positions = [list(set([part_pos_dict[pos] for pos in gear])) for gear in gear_ratio_pos]
-        return [gear[0][1] * gear[-1][1] for gear in positions if len(gear) == 2]
-
-
-# Tests
-test_schema = parse_schematic("inputs/day03/test.txt")
-assert sum(implement_schematic(test_schema)) == 4361
-assert sum(implement_schematic(test_schema, return_type="gear_ratios")) == 467835
-
-# Solutions
-schema = parse_schematic("inputs/day03/main.txt")
-print(f"Part 1: The Sum of Parts Numbers - {sum(implement_schematic(schema))}")
-print(f"Part 2: The Sum of Gear Rations - {sum(implement_schematic(schema, return_type='gear_ratios'))}")
+        # Only gears need the cell labels, parts just check each number's span against the adjacency mask
+        adjacency_mask = get_symbol_adjacency_mask(grid)
+        return [
+            int(match.group())
+            for row, adjacent in zip(grid, adjacency_mask)
+            for match in NUMBER_PATTERN.finditer(row)
+            if any(adjacent[match.start() : match.end()])
+        ]
+    labels, runs = label_number_runs(grid)
+    gear_ratios = []
+    for row_ix, row in enumerate(grid):
+        for match in GEAR_PATTERN.finditer(row):
+            # Any number touching a "*" is a part no, dedupe its digit neighbors through their labels
+            col_lb, col_ub = max(0, match.start() - 1), min(M, match.start() + 2)
+            neighbor_labels = {
+                labels[nbr_row * M + nbr_col]
+                for nbr_row in range(max(0, row_ix - 1), min(N, row_ix + 2))
+                for nbr_col in range(col_lb, col_ub)
+            }
+            neighbor_labels.discard(0)
+            if len(neighbor_labels) == 2:
+                label1, label2 = neighbor_labels
+                gear_ratios.append(runs[label1 - 1][3] * runs[label2 - 1][3])
+    return gear_ratios
+
+
+def scan_row(row: bytes) -> ScannedRow:
+    runs = [(match.start(), match.end(), int(match.group())) for match in NUMBER_PATTERN.finditer(row)]
+    return row, dilate_row_symbols(row), [start for start, _, _ in runs], runs
+
+
+def get_window_results(prev: ScannedRow, cur: ScannedRow, nxt: ScannedRow) -> Iterator[Tuple[str, int]]:
+    row, _, _, runs = cur
+    adjacency = (prev[1] | cur[1] | nxt[1]).to_bytes(len(row), "big")
+    for start, end, value in runs:
+        if any(adjacency[start:end]):
+            yield "part_nos", value
+    for match in GEAR_PATTERN.finditer(row):
+        col, neighbors = match.start(), []
+        for _, _, starts, row_runs in (prev, cur, nxt):
+            # Runs are disjoint and sorted, walk back from the last one starting by col + 1 while they reach col
+            run_ix = bisect_right(starts, col + 1) - 1
+            while run_ix >= 0 and row_runs[run_ix][1] >= col:
+                neighbors.append(row_runs[run_ix][2])
+                run_ix -= 1
+        if len(neighbors) == 2:
+            yield "gear_ratios", neighbors[0] * neighbors[1]
+
+
+def stream_schematic(rows: Iterable[bytes]) -> Iterator[Tuple[str, int]]:
+    """Yield ("part_nos", value) and ("gear_ratios", value) as soon as the rows around them are read, only ever
+    holding three rows so memory is bounded by the schematic's width rather than its height"""
+    blank: ScannedRow = (b"", 0, [], [])
+    prev, cur = blank, None
+    for nxt in chain(map(scan_row, rows), [blank]):
+        if cur is not None:
+            yield from get_window_results(prev, cur, nxt)
+            prev = cur
+        cur = nxt
+
+
+def sum_streamed_schematic(input_fp: str) -> Tuple[int, int]:
+    sums = {"part_nos": 0, "gear_ratios": 0}
+    for result_type, value in stream_schematic(iter_lines(input_fp)):
+        sums[result_type] += value
+    return sums["part_nos"], sums["gear_ratios"]
+
+
+def sum_part_nos(schematic: Schematic) -> int:
+    return sum(implement_schematic(schematic))
+
+
+def sum_gear_ratios(schematic: Schematic) -> int:
+    return sum(implement_schematic(schematic, return_type="gear_ratios"))
+
+
+INPUT_FP = "inputs/day03/main.txt"
+SOLVER = (parse_schematic, sum_part_nos, sum_gear_ratios)
+
+
+def run_tests() -> None:
+    test_schema = parse_schematic("inputs/day03/test.txt")
+    assert sum(implement_schematic(test_schema)) == 4361
+    assert sum(implement_schematic(test_schema, return_type="gear_ratios")) == 467835
+    assert sum_streamed_schematic("inputs/day03/test.txt") == (4361, 467835)
@@ -1,47 +1,68 @@
-from typing import Dict, List, Set, Tuple, TypeAlias
+from array import array
+from typing import Iterable, List, Tuple, TypeAlias
 
-GameMap: TypeAlias = Dict[int, Tuple[List[int], Set[int]]]
+from solutions.puzzle_input import iter_lines, read_ints
+
+# Each card is packed into integer bitmasks, bit k set iff number k is on the card: (game numbers, winning numbers)
+GameMap: TypeAlias = Tuple[List[int], List[int]]
+
+
+def pack_numbers(numbers: bytes) -> int:
+    mask = 0
+    for d in read_ints(numbers):
+        mask |= 1 << d
+    return mask
 
 
 def load_games(input_fp: str) -> GameMap:
-    # Track game numbers as the a tuple, map it to set of of winning numbers, append row number
-    # To end of game numbers to ensure unique keys.
-    game_map = {}
-    split_input = [line.split(": ")[1].split(" | ") for line in open(input_fp).read().split("\n")]
-    for k, game in enumerate(split_input):
-        game_map[k] = ([int(d) for d in game[1].split()], set(int(d) for d in game[0].split()))
-    return game_map
+    return load_game_lines(iter_lines(input_fp))
 
 
-def count_winning_points(games: GameMap) -> List[int]:
-    points = []
-    for _, game_config in games.items():
-        game_numbers, winning_numbers = game_config
-        game_winning_numbers = [num for num in game_numbers if num in winning_numbers]
-        points.append(int(2 ** (len(game_winning_numbers) - 1)))
-    return points
+def load_game_lines(game_lines: Iterable[bytes]) -> GameMap:
+    # Line index tracks game number
+    game_masks, winning_masks = [], []
+    for line in game_lines:
+        winning_numbers, game_numbers = line.split(b": ")[1].split(b" | ")
+        game_masks.append(pack_numbers(game_numbers))
+        winning_masks.append(pack_numbers(winning_numbers))
+    return game_masks, winning_masks
+
 
+def get_match_counts(games: GameMap) -> array:
+    return array("I", [(game_mask & winning_mask).bit_count() for game_mask, winning_mask in zip(*games)])
 
-def get_game_winning_cards(game_no: int, game_numbers: List[int], winning_numbers: Set[int]) -> List[int]:
-    return list(range(game_no + 1, game_no + 1 + len([num for num in game_numbers if num in winning_numbers])))
+
+def count_winning_points(games: GameMap) -> List[int]:
+    return [(1 << matches) >> 1 for matches in get_match_counts(games)]
 
 
 def count_total_scratchcards(games: GameMap) -> int:
-    card_count = {game_no: 1 for game_no in range(len(games))}
-    for game_no, game_config in games.items():
-        won_cards = get_game_winning_cards(game_no, game_config[0], game_config[1])
-        for winning_game_no in won_cards:
-            card_count[winning_game_no] += card_count[game_no]
-    return sum(card_count.values())
+    return cascade_scratchcards(get_match_counts(games))
+
+
+def cascade_scratchcards(match_counts: array) -> int:
+    # Each card adds its copy count to the next `matches` cards, track those range additions as a difference array
+    copy_deltas = [0] * (len(match_counts) + 1)
+    won_copies, total_cards = 0, 0
+    for game_no, matches in enumerate(match_counts):
+        won_copies += copy_deltas[game_no]
+        card_count = 1 + won_copies
+        total_cards += card_count
+        if matches:
+            copy_deltas[game_no + 1] += card_count
+            copy_deltas[min(len(match_counts), game_no + 1 + matches)] -= card_count
+    return total_cards
+
+
+def sum_winning_points(games: GameMap) -> int:
+    return sum(count_winning_points(games))
 
 
-# Tests
-test_games = load_games("inputs/day04/test.txt")
-assert count_winning_points(test_games) == [8, 2, 2, 1, 0, 0]
-assert count_total_scratchcards(test_games) == 30
+INPUT_FP = "inputs/day04/main.txt"
+SOLVER = (load_games, sum_winning_points, count_total_scratchcards)
 
 
-# Solutions
-games = load_games("inputs/day04/main.txt")
-print(f"Part 1: The Scratchcards have a points total of - {sum(count_winning_points(games))}")
-print(f"Part 2: Total Scratchcards Won - {count_total_scratchcards(games)}")
+def run_tests() -> None:
+    test_games = load_games("inputs/day04/test.txt")
+    assert count_winning_points(test_games) == [8, 2, 2, 1, 0, 0]
+    assert count_total_scratchcards(test_games) == 30
@@ -1,8 +1,15 @@
+from bisect import bisect_right
 from functools import partial
 from typing import Dict, List, Optional, Tuple, TypeAlias
 
+from solutions.puzzle_input import iter_paragraphs, read_ints
+
 Interval: TypeAlias = Tuple[int, int]  # We will represent union of intervals as an ordered even numbered list.
 AlmanacMap: TypeAlias = Dict[str, partial[Tuple[int, str]]]
+# Piecewise map x -> x + offsets[k] for breakpoints[k] <= x < breakpoints[k + 1], last piece is unbounded above
+PiecewiseMap: TypeAlias = Tuple[List[int], List[int]]
+IDENTITY_MAP: PiecewiseMap = ([0], [0])
+CompiledAlmanac: TypeAlias = Tuple[List[Interval], List[Interval], PiecewiseMap]  # (seeds, seed ranges, map)
 
 
 def get_interval_intersection_and_difference(
@@ -51,19 +58,19 @@ def attribute_map(
 
 
 def load_almanac_map(input_fp: str) -> Tuple[List[Interval], List[Interval], AlmanacMap]:
-    parts = open(input_fp).read().split("\n\n")
-    seeds_nos = [int(d) for d in parts[0][len("seeds: ") :].split()]
+    parts = iter_paragraphs(input_fp)
+    seeds_nos = read_ints(next(parts))
     seed_singletons = [(seed, seed) for seed in seeds_nos]
     seed_ranges = [(seeds_nos[k], seeds_nos[k] + seeds_nos[k + 1] - 1) for k in range(0, len(seeds_nos), 2)]
     almanac_map = {}
-    for raw_mapping in parts[1:]:
-        map_parts = raw_mapping.split("\n")
-        source, target = tuple(map_parts[0].split()[0].split("-to-"))
+    for raw_mapping in parts:
+        map_parts = raw_mapping.split(b"\n")
+        source, target = tuple(map_parts[0].split()[0].decode().split("-to-"))
         target_ranges, source_ranges = [], []
         for map in map_parts[1:]:
-            target_start, source_start, intv_len = tuple(map.split())
-            target_ranges.append((int(target_start), int(target_start) + int(intv_len) - 1))
-            source_ranges.append((int(source_start), int(source_start) + int(intv_len) - 1))
+            target_start, source_start, intv_len = read_ints(map)
+            target_ranges.append((target_start, target_start + intv_len - 1))
+            source_ranges.append((source_start, source_start + intv_len - 1))
         almanac_map[source] = partial(
             attribute_map,
             target_name=str(target),
@@ -73,21 +80,90 @@ def load_almanac_map(input_fp: str) -> Tuple[List[Interval], List[Interval], Alm
     return seed_singletons, seed_ranges, almanac_map
 
 
-def get_min_seed_location(seed_ranges: List[Interval], almanac_map: AlmanacMap) -> int:
-    target = "seed"
-    return_val = seed_ranges
-    while target != "location":
-        return_val, target = almanac_map[target](return_val)
-    return return_val[0][0]
+def get_stage_map(source_ranges: List[Interval], target_ranges: List[Interval]) -> PiecewiseMap:
+    # Pieces not covered by a rule keep offset 0, i.e. map to themselves
+    breakpoints, offsets = [0], [0]
+    for source_range, target_range in sorted(zip(source_ranges, target_ranges)):
+        if source_range[0] > breakpoints[-1]:
+            breakpoints.append(source_range[0])
+            offsets.append(0)
+        offsets[-1] = target_range[0] - source_range[0]
+        breakpoints.append(source_range[1] + 1)
+        offsets.append(0)
+    return breakpoints, offsets
+
+
+def compose_maps(inner: PiecewiseMap, outer: PiecewiseMap) -> PiecewiseMap:
+    """Piecewise map for outer(inner(x)), splitting each inner piece's image at the outer breakpoints"""
+    breakpoints: List[int] = []
+    offsets: List[int] = []
+    for k, (piece_start, inner_offset) in enumerate(zip(*inner)):
+        image_end = inner[0][k + 1] + inner_offset if k + 1 < len(inner[0]) else None
+        outer_ix = bisect_right(outer[0], piece_start + inner_offset) - 1
+        while outer_ix < len(outer[0]) and (image_end is None or outer[0][outer_ix] < image_end):
+            offset = inner_offset + outer[1][outer_ix]
+            if not offsets or offsets[-1] != offset:
+                # Merge adjacent pieces sharing an offset to keep the composed map minimal
+                breakpoints.append(max(piece_start, outer[0][outer_ix] - inner_offset))
+                offsets.append(offset)
+            outer_ix += 1
+    return breakpoints, offsets
+
+
+def compile_almanac_map(almanac_map: AlmanacMap, source: str = "seed", target: str = "location") -> PiecewiseMap:
+    """Compose every stage between source and target into a single piecewise map"""
+    compiled_map = IDENTITY_MAP
+    while source != target:
+        stage = almanac_map[source].keywords
+        compiled_map = compose_maps(compiled_map, get_stage_map(stage["source_ranges"], stage["target_ranges"]))
+        source = stage["target_name"]
+    return compiled_map
+
+
+def get_seed_location(seed: int, compiled_map: PiecewiseMap) -> int:
+    return seed + compiled_map[1][bisect_right(compiled_map[0], seed) - 1]
+
+
+def get_location_intervals(seed_ranges: List[Interval], compiled_map: PiecewiseMap) -> List[Interval]:
+    # Linear merge of the sorted seed ranges against the breakpoints
+    breakpoints, offsets = compiled_map
+    location_intervals = []
+    piece_ix = 0
+    for lb, ub in sorted(seed_ranges):
+        while piece_ix + 1 < len(breakpoints) and breakpoints[piece_ix + 1] <= lb:
+            piece_ix += 1
+        cur_ix = piece_ix
+        while cur_ix < len(breakpoints) and breakpoints[cur_ix] <= ub:
+            piece_ub = ub if cur_ix + 1 == len(breakpoints) else min(ub, breakpoints[cur_ix + 1] - 1)
+            location_intervals.append((max(lb, breakpoints[cur_ix]) + offsets[cur_ix], piece_ub + offsets[cur_ix]))
+            cur_ix += 1
+    return location_intervals
+
+
+def get_min_seed_location(seed_ranges: List[Interval], compiled_map: PiecewiseMap) -> int:
+    return min(intv[0] for intv in get_location_intervals(seed_ranges, compiled_map))
+
+
+def load_compiled_almanac(input_fp: str) -> CompiledAlmanac:
+    seeds, seed_ranges, almanac_map = load_almanac_map(input_fp)
+    return seeds, seed_ranges, compile_almanac_map(almanac_map)
+
+
+def get_min_single_seed_location(almanac: CompiledAlmanac) -> int:
+    return get_min_seed_location(almanac[0], almanac[2])
+
+
+def get_min_seed_range_location(almanac: CompiledAlmanac) -> int:
+    return get_min_seed_location(almanac[1], almanac[2])
 
 
-# Tests
-test_seeds, test_seed_ranges, test_map = load_almanac_map("inputs/day05/test.txt")
-assert get_min_seed_location(test_seeds, test_map) == 35
-assert get_min_seed_location(test_seed_ranges, test_map) == 46
+INPUT_FP = "inputs/day05/main.txt"
+SOLVER = (load_compiled_almanac, get_min_single_seed_location, get_min_seed_range_location)
 
 
-# Solutions
-seeds, seed_ranges, almanac_map = load_almanac_map("inputs/day05/main.txt")
-print(f"Part 1: Closest Location - {get_min_seed_location(seeds, almanac_map)}")
-print(f"Part 2: Closet Location - {get_min_seed_location(seed_ranges, almanac_map)}")
+def run_tests() -> None:
+    test_seeds, test_seed_ranges, test_map = load_almanac_map("inputs/day05/test.txt")
+    test_compiled_map = compile_almanac_map(test_map)
+    assert [get_seed_location(seed[0], test_compiled_map) for seed in test_seeds] == [82, 43, 86, 35]
+    assert get_min_seed_location(test_seeds, test_compiled_map) == 35
+    assert get_min_seed_location(test_seed_ranges, test_compiled_map) == 46
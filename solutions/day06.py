@@ -1,29 +1,37 @@
 import math
-from typing import List, Tuple, TypeAlias
+from typing import List, Sequence, Tuple, TypeAlias
+
+from solutions.puzzle_input import iter_lines, read_ints
 
 RaceStats: TypeAlias = List[Tuple[int, int]]  # (duration, record) = single stat
 
 
 def load_race_stats(input_fp: str) -> RaceStats:
-    lines = open(input_fp).read().split("\n")
-    stats = []
-    for d, r in zip(lines[0].replace("Time:", "").split(), lines[1].replace("Distance:", "").split()):
-        stats.append((int(d), int(r)))
-    return stats
+    durations, records = (read_ints(line) for line in iter_lines(input_fp))
+    return list(zip(durations, records))
 
 
 def get_no_winning_times(duration: int, record: int) -> int:
     # Need to solve record < (duration - hold_time) * hold_time or in polynomial form
     # 0 > x^2 - Dx + R  (D = duration, x = holdtime, R = record)
-    discrim_root = math.sqrt(duration**2 - (4 * record))
-    return math.ceil(0.5 * (duration + discrim_root)) - int(0.5 * (duration - discrim_root)) - 1
+    # Integer sqrt keeps this exact for arbitrarily large races, floats lose precision past 2^53
+    discrim = duration**2 - 4 * record
+    if discrim <= 0:
+        return 0
+    min_hold = (duration - math.isqrt(discrim)) // 2
+    # floor of the smaller root can be off by one from the first strictly winning hold time
+    while min_hold * (duration - min_hold) <= record and 2 * min_hold <= duration:
+        min_hold += 1
+    # winning hold times are symmetric about duration / 2
+    return max(0, duration - 2 * min_hold + 1)
+
+
+def get_winning_time_counts(durations: Sequence[int], records: Sequence[int]) -> List[int]:
+    return list(map(get_no_winning_times, durations, records))
 
 
 def get_margin_of_error(race_stats: RaceStats) -> int:
-    margin = 1
-    for duration, record in race_stats:
-        margin *= get_no_winning_times(duration, record)
-    return margin
+    return math.prod(get_winning_time_counts([d for d, _ in race_stats], [r for _, r in race_stats]))
 
 
 def fix_race_stat(race_stats: RaceStats) -> Tuple[int, int]:
@@ -35,15 +43,18 @@ def fix_race_stat(race_stats: RaceStats) -> Tuple[int, int]:
     return int(duration_str), int(record_str)
 
 
-# Tests
-test_races = load_race_stats("inputs/day06/test.txt")
-assert get_no_winning_times(15, 40) == 8
-assert get_margin_of_error(test_races) == 288
-assert fix_race_stat(test_races) == (71530, 940200)
+def get_fixed_race_winning_times(race_stats: RaceStats) -> int:
+    return get_no_winning_times(*fix_race_stat(race_stats))
+
+
+INPUT_FP = "inputs/day06/main.txt"
+SOLVER = (load_race_stats, get_margin_of_error, get_fixed_race_winning_times)
 
 
-# Solutions
-races = load_race_stats("inputs/day06/main.txt")
-long_d, long_r = fix_race_stat(races)
-print(f"Part 1: Margin of Error - {get_margin_of_error(races)}")
-print(f"Part 2: Number of ways to win - {get_no_winning_times(long_d, long_r)}")
+def run_tests() -> None:
+    test_races = load_race_stats("inputs/day06/test.txt")
+    assert get_no_winning_times(15, 40) == 8
+    assert get_no_winning_times(10**20, 10**40 // 4 - 1) == 1
+    assert get_winning_time_counts([7, 15, 30, 4], [9, 40, 200, 4]) == [4, 8, 9, 0]
+    assert get_margin_of_error(test_races) == 288
+    assert fix_race_stat(test_races) == (71530, 940200)
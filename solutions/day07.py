@@ -1,65 +1,221 @@
-from collections import defaultdict
-from functools import cmp_to_key
-from typing import List, Literal, Tuple
+from array import array
+from collections import Counter, defaultdict
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Tuple, TypeAlias
+
+from solutions.puzzle_input import iter_lines
 
 CARD_RANK_ORDER = "AKQJT98765432"
 WILD_CARD_RANK_ORDER = "AKQT98765432J"
+CARD_BITS = 4  # card ranks fit in a nibble, strength goes above the 5 packed card ranks
+HAND_SIZE = 5
+KEY_SPACE = 11 << (CARD_BITS * HAND_SIZE)  # hand strength is at most 10 (five of a kind)
+HandArrays: TypeAlias = Tuple[array, array]  # (packed hand keys, bids) struct-of-arrays
+FenwickTree: TypeAlias = Dict[int, int]  # Sparse, only nodes that have been touched are stored
+
+
+def get_hand_strength(hand_string: str, jokers_wild: bool = False) -> int:
+    counts = Counter(hand_string)
+    joker_count = counts.pop("J", 0) if jokers_wild else 0
+    sorted_cnts = [0, 0] + sorted(counts.values())  # Padding ensures len(sorted_count) >= 2
+    return 2 * (sorted_cnts[-1] + joker_count) + sorted_cnts[-2]
+
+
+def get_hand_key(hand_string: str, jokers_wild: bool = False) -> int:
+    """Pack hand strength and card ranks into a single int, larger key = stronger hand"""
+    rank_order = WILD_CARD_RANK_ORDER if jokers_wild else CARD_RANK_ORDER
+    key = get_hand_strength(hand_string, jokers_wild)
+    for card in hand_string:
+        # My encoding makes a lower card rank beat a higher card rank, flip it so keys sort ascending
+        key = (key << CARD_BITS) | (len(rank_order) - 1 - rank_order.index(card))
+    return key
 
 
 class Hand:
+    __slots__ = ("hand", "jokers_wild", "key")
+
     def __init__(self, hand_string: str, jokers_wild: bool = False):
-        self.hand = list(hand_string)
+        self.hand = hand_string
         self.jokers_wild = jokers_wild
-        if not jokers_wild:
-            self.card_ranks = [CARD_RANK_ORDER.index(c) for c in list(self.hand)]
-        else:
-            self.card_ranks = [WILD_CARD_RANK_ORDER.index(c) for c in list(self.hand)]
+        self.key = get_hand_key(hand_string, jokers_wild)
 
     def hand_strength(self) -> int:
-        counts = {card: self.hand.count(card) for card in self.hand + ["dummy"]}
-        joker_count = 0
-        if self.jokers_wild:
-            joker_count = int(counts.get("J", 0))
-            counts["J"] = 0
-        sorted_cnts = sorted(counts.values())
-        return 2 * (sorted_cnts[-1] + joker_count) + sorted_cnts[-2]  # Dummy ensures len(sorted_count) >= 2
+        return self.key >> (CARD_BITS * len(self.hand))
 
 
 def hand_compare(hand1: Hand, hand2: Hand) -> Literal[-1, 0, 1]:
     """Check if hand1 > hand2"""
-    if hand1.hand_strength() != hand2.hand_strength():
-        return 2 * int(hand1.hand_strength() > hand2.hand_strength()) - 1
-    else:
-        for card_rank_h1, card_rank_h2 in zip(hand1.card_ranks, hand2.card_ranks):
-            if card_rank_h1 != card_rank_h2:
-                # My encoding makes a lower card rank beat a higher card rank
-                return 2 * (card_rank_h1 < card_rank_h2) - 1
-        return 0
+    return (hand1.key > hand2.key) - (hand1.key < hand2.key)  # type: ignore[return-value]
 
 
 def hand_bid_compare(hand_and_bid1: Tuple[Hand, int], hand_and_bid2: Tuple[Hand, int]) -> Literal[-1, 0, 1]:
     return hand_compare(hand_and_bid1[0], hand_and_bid2[0])
 
 
+def iter_hands_and_bids(input_fp: str) -> Iterator[Tuple[str, int]]:
+    for line in iter_lines(input_fp):
+        hand, bid = line.split()
+        yield hand.decode(), int(bid)
+
+
 def load_hands_and_bids(input_fp: str, jokers_wild: bool = False) -> List[Tuple[Hand, int]]:
-    return [
-        (Hand(line.split(" ")[0], jokers_wild), int(line.split(" ")[1])) for line in open(input_fp).read().split("\n")
-    ]
+    return [(Hand(hand, jokers_wild), bid) for hand, bid in iter_hands_and_bids(input_fp)]
+
+
+def get_hand_arrays(hands_and_bids: Iterable[Tuple[str, int]], jokers_wild: bool = False) -> HandArrays:
+    # Skip Hand objects entirely, only keep the packed keys and bids for large hand streams
+    keys, bids = array("Q"), array("Q")
+    for hand, bid in hands_and_bids:
+        keys.append(get_hand_key(hand, jokers_wild))
+        bids.append(bid)
+    return keys, bids
+
+
+def load_hand_arrays(input_fp: str, jokers_wild: bool = False) -> HandArrays:
+    return get_hand_arrays(iter_hands_and_bids(input_fp), jokers_wild)
+
+
+def load_raw_hands(input_fp: str) -> List[Tuple[str, int]]:
+    # Keys depend on the jokers rule, so keep the hand strings and key them per part
+    return list(iter_hands_and_bids(input_fp))
 
 
 def get_winnings(hands_and_bids: List[Tuple[Hand, int]]) -> int:
-    return sum((k + 1) * hb[1] for k, hb in enumerate(sorted(hands_and_bids, key=cmp_to_key(hand_bid_compare))))
+    return sum((k + 1) * hb[1] for k, hb in enumerate(sorted(hands_and_bids, key=lambda hb: hb[0].key)))
+
+
+def get_array_winnings(hand_arrays: HandArrays) -> int:
+    keys, bids = hand_arrays
+    return sum((k + 1) * bids[ix] for k, ix in enumerate(sorted(range(len(keys)), key=keys.__getitem__)))
+
 
+def get_raw_hand_winnings(raw_hands: List[Tuple[str, int]], jokers_wild: bool = False) -> int:
+    return get_array_winnings(get_hand_arrays(raw_hands, jokers_wild))
 
-# Tests
-test_hands_and_bids = load_hands_and_bids("inputs/day07/test.txt")
-test_hands_and_bids_wild = load_hands_and_bids("inputs/day07/test.txt", jokers_wild=True)
-assert get_winnings(test_hands_and_bids) == 6440
-assert get_winnings(test_hands_and_bids_wild) == 5905
 
+def fenwick_add(tree: FenwickTree, ix: int, val: int, size: int = KEY_SPACE) -> None:
+    ix += 1
+    while ix <= size:
+        tree[ix] = tree.get(ix, 0) + val
+        ix += ix & -ix
 
-# Solutions
-hands_and_bids = load_hands_and_bids("inputs/day07/main.txt")
-hands_and_bids_wild = load_hands_and_bids("inputs/day07/main.txt", jokers_wild=True)
-print(f"Part 1: Total winnings - {get_winnings(hands_and_bids)}")
-print(f"Part 2: Total winnings - {get_winnings(hands_and_bids_wild)}")
+
+def fenwick_prefix_sum(tree: FenwickTree, ix: int) -> int:
+    """Sum of values at indices <= ix"""
+    total, ix = 0, ix + 1
+    while ix > 0:
+        total += tree.get(ix, 0)
+        ix -= ix & -ix
+    return total
+
+
+class RankedHands:
+    """Hands ranked by key with winnings kept current, equal hands are ranked in insertion order"""
+
+    def __init__(self, jokers_wild: bool = False):
+        self.jokers_wild = jokers_wild
+        self.counts: FenwickTree = {}
+        self.bid_sums: FenwickTree = {}
+        self.ties: Dict[int, List[Tuple[int, int]]] = defaultdict(list)  # key -> (insertion seq, bid), oldest first
+        self.next_seq = 0
+        self.total_bids = 0
+        self.winnings = 0
+
+    def __len__(self) -> int:
+        return fenwick_prefix_sum(self.counts, KEY_SPACE - 1)
+
+    def _placement_delta(self, key: int, tie_ix: int, bid: int) -> int:
+        # Placing a hand at rank r pays r * bid and pushes every hand ranked after it up one rank
+        rank = fenwick_prefix_sum(self.counts, key - 1) + tie_ix + 1
+        later_bids = self.total_bids - fenwick_prefix_sum(self.bid_sums, key)
+        later_bids += sum(tie_bid for _, tie_bid in self.ties[key][tie_ix:])
+        return rank * bid + later_bids
+
+    def insert(self, hand: str, bid: int) -> int:
+        """Rank the hand after any equal hands, returning its insertion seq to remove this instance later"""
+        key = get_hand_key(hand, self.jokers_wild)
+        self.winnings += self._placement_delta(key, len(self.ties[key]), bid)
+        fenwick_add(self.counts, key, 1)
+        fenwick_add(self.bid_sums, key, bid)
+        seq, self.next_seq = self.next_seq, self.next_seq + 1
+        self.ties[key].append((seq, bid))
+        self.total_bids += bid
+        return seq
+
+    def remove(self, hand: str, bid: int, seq: Optional[int] = None) -> None:
+        """Remove the hand inserted as seq, or without a seq the earliest inserted instance of the hand and bid"""
+        key = get_hand_key(hand, self.jokers_wild)
+        ties = self.ties.get(key, [])
+        tie_ix = next(
+            (ix for ix, (tie_seq, tie_bid) in enumerate(ties) if tie_bid == bid and seq in (None, tie_seq)), None
+        )
+        if tie_ix is None:
+            raise KeyError(f"{hand} {bid} is not ranked")
+        ties.pop(tie_ix)
+        fenwick_add(self.counts, key, -1)
+        fenwick_add(self.bid_sums, key, -bid)
+        self.total_bids -= bid
+        # Removal exactly undoes placing the hand at its position among what remains
+        self.winnings -= self._placement_delta(key, tie_ix, bid)
+        if not ties:
+            del self.ties[key]
+
+
+class HandStream:
+    """Keeps winnings current under both the standard and jokers wild orderings"""
+
+    def __init__(self) -> None:
+        self.rankings = {jokers_wild: RankedHands(jokers_wild) for jokers_wild in (False, True)}
+
+    def insert(self, hand: str, bid: int) -> int:
+        # Both rankings see the same inserts, so they hand out the same seq
+        seq = self.rankings[False].insert(hand, bid)
+        self.rankings[True].insert(hand, bid)
+        return seq
+
+    def remove(self, hand: str, bid: int, seq: Optional[int] = None) -> None:
+        for ranking in self.rankings.values():
+            ranking.remove(hand, bid, seq)
+
+    def get_winnings(self, jokers_wild: bool = False) -> int:
+        return self.rankings[jokers_wild].winnings
+
+
+def get_stream_winnings(hand_stream: HandStream, jokers_wild: bool = False) -> int:
+    return hand_stream.get_winnings(jokers_wild)
+
+
+def load_hand_stream(input_fp: str) -> HandStream:
+    hand_stream = HandStream()
+    for hand, bid in iter_hands_and_bids(input_fp):
+        hand_stream.insert(hand, bid)
+    return hand_stream
+
+
+INPUT_FP = "inputs/day07/main.txt"
+# One off runs rank with a key sort, HandStream is for inputs that keep changing (see solutions.server)
+SOLVER = (load_raw_hands, get_raw_hand_winnings, partial(get_raw_hand_winnings, jokers_wild=True))
+STREAM_SOLVER = (load_hand_stream, get_stream_winnings, partial(get_stream_winnings, jokers_wild=True))
+
+
+def run_tests() -> None:
+    test_hands_and_bids = load_hands_and_bids("inputs/day07/test.txt")
+    test_hands_and_bids_wild = load_hands_and_bids("inputs/day07/test.txt", jokers_wild=True)
+    assert get_winnings(test_hands_and_bids) == 6440
+    assert get_winnings(test_hands_and_bids_wild) == 5905
+    assert get_array_winnings(load_hand_arrays("inputs/day07/test.txt")) == 6440
+    assert get_array_winnings(load_hand_arrays("inputs/day07/test.txt", jokers_wild=True)) == 5905
+    # Equal hands rank in input order
+    assert get_raw_hand_winnings([("22345", 5), ("22345", 1)]) == 7
+    test_stream = load_hand_stream("inputs/day07/test.txt")
+    assert (test_stream.get_winnings(), test_stream.get_winnings(jokers_wild=True)) == (6440, 5905)
+    test_stream.insert("AAAAA", 1)
+    test_stream.remove("AAAAA", 1)
+    assert (test_stream.get_winnings(), test_stream.get_winnings(jokers_wild=True)) == (6440, 5905)
+    dup_stream = HandStream()
+    first_seq = dup_stream.insert("22345", 5)
+    dup_stream.insert("22345", 1)
+    assert dup_stream.get_winnings() == get_raw_hand_winnings([("22345", 5), ("22345", 1)]) == 7
+    dup_stream.insert("22345", 5)
+    dup_stream.remove("22345", 5, first_seq)
+    assert dup_stream.get_winnings() == get_raw_hand_winnings([("22345", 1), ("22345", 5)]) == 11
@@ -1,58 +1,238 @@
-from functools import reduce
-from math import lcm
-from typing import Dict, List, Tuple, TypeAlias
+from array import array
+from bisect import bisect_left
+from itertools import product
+from math import gcd, lcm
+from typing import Dict, List, Optional, Set, Tuple, TypeAlias
+
+from solutions.puzzle_input import iter_paragraphs
 
 NetworkMap: TypeAlias = Dict[str, Dict[str, str]]
+# Node names indexed by integer id, with flat left / right successor id arrays
+CompiledNetwork: TypeAlias = Tuple[List[str], array, array]
+NetworkInput: TypeAlias = Tuple[str, NetworkMap]  # (step sequence, network map)
+GhostCycle: TypeAlias = Tuple[int, int, List[int]]  # (cycle start step, period, Z hit steps before cycle end)
+Congruence: TypeAlias = Tuple[int, int]  # x = residue mod modulus
+ResidueSet: TypeAlias = Tuple[Set[int], int]  # (residues, the modulus they share)
 
 
 def get_network_map(input_rows: str) -> NetworkMap:
     return {row[:3]: {"L": row[-9:-6], "R": row[-4:-1]} for row in input_rows.split("\n")}
 
 
-def count_steps(input_fp: str) -> int:
-    step_seq, map_rows = tuple(open(input_fp).read().split("\n\n"))
-    network_map = get_network_map(map_rows)
-    steps, position = 0, "AAA"
-    while position != "ZZZ":
-        position = network_map[position][step_seq[steps % len(step_seq)]]
-        steps += 1
-    return steps
-
-
-def get_cycles(step_seq: str, network_map: NetworkMap, start_pos: str) -> List[Tuple[int, int]]:
-    steps, position, dx = 0, start_pos, 0
-    seen_pos, z_locs = {}, []
-    while (dx, position) not in seen_pos:
-        seen_pos[(dx, position)] = steps
-        if position.endswith("Z"):
-            z_locs.append((steps, position))
-        position = network_map[position][step_seq[dx]]
-        steps += 1
-        dx = steps % len(step_seq)
-    return [(z_pos[0], steps - seen_pos[(dx, position)]) for z_pos in z_locs]
-
-
-def count_spooky_ghost_steps(input_fp: str) -> int:
-    step_seq, map_rows = tuple(open(input_fp).read().split("\n\n"))
-    network_map = get_network_map(map_rows)
-    cycles = []
-    for start in [pos for pos in network_map if pos.endswith("A")]:
-        cycles.extend(get_cycles(step_seq, network_map, start))
-    if all(cycle[1] % cycle[0] == 0 for cycle in cycles) and len(cycles) == [p for p in network_map if p.endswith("A")]:
-        return lcm(*[c[0] for c in cycles])
-    # If this were not the case there multiple cycles, i.e Z positions in cycle per start position
-    # we'd have to take the min LCM over all choices of a single Z pos per start,
-    # e.g [[z11, z12], [z21]] -> min(LCM(c11, c21), LCM(c12, c21)). If the divisbility condition fails
-    # much harder needs CRT + coprime conditions on cycle lengths...But my data seems to satisfy above...
-    else:
-        return 1
-
-
-# Tests
-assert count_steps("inputs/day08/test.txt") == 2
-assert count_steps("inputs/day08/test2.txt") == 6
-assert count_spooky_ghost_steps("inputs/day08/test3.txt") == 6
-
-# Solutions
-print(f"Part 1: Total Steps - {count_steps('inputs/day08/main.txt')}")
-print(f"Part 2: Total Spooky Ghost Steps - {count_spooky_ghost_steps('inputs/day08/main.txt')}")
+def load_network(input_fp: str) -> NetworkInput:
+    step_seq, map_rows = (paragraph.decode() for paragraph in iter_paragraphs(input_fp))
+    return step_seq, get_network_map(map_rows)
+
+
+def compile_network(network_map: NetworkMap) -> CompiledNetwork:
+    names = list(network_map)
+    node_ids = {name: k for k, name in enumerate(names)}
+    left = array("I", [node_ids[network_map[name]["L"]] for name in names])
+    right = array("I", [node_ids[network_map[name]["R"]] for name in names])
+    return names, left, right
+
+
+class JumpTable:
+    """Binary lifting over full passes of the step sequence, for long horizon position / first target queries"""
+
+    def __init__(self, step_seq: str, network: CompiledNetwork, target_mask: bytes, max_steps: int = 1 << 40):
+        names, left, right = network
+        self.moves = [right if step == "R" else left for step in step_seq]
+        # first_target[node] = first step offset within a pass started at node that sits on a target, -1 if none
+        positions = list(range(len(names)))
+        self.first_target = array("q", [-1]) * len(names)
+        for offset, move in enumerate(self.moves):
+            for node, position in enumerate(positions):
+                if self.first_target[node] < 0 and target_mask[position]:
+                    self.first_target[node] = offset
+            positions = [move[position] for position in positions]
+        # passes[j][node] = node after 2^j passes, pass_hits[j][node] = whether a target is seen during them
+        self.passes = [array("I", positions)]
+        self.pass_hits = [bytearray(offset >= 0 for offset in self.first_target)]
+        while (1 << len(self.passes)) * len(step_seq) <= max_steps:
+            jump, hits = self.passes[-1], self.pass_hits[-1]
+            self.passes.append(array("I", [jump[jump[node]] for node in range(len(names))]))
+            self.pass_hits.append(bytearray(hits[node] or hits[jump[node]] for node in range(len(names))))
+
+    def get_position(self, start_id: int, steps: int) -> int:
+        num_passes, remainder = divmod(steps, len(self.moves))
+        if num_passes >> len(self.passes):
+            raise ValueError(f"{steps} steps is beyond the jump table horizon")
+        position, level = start_id, 0
+        while num_passes:
+            if num_passes & 1:
+                position = self.passes[level][position]
+            num_passes, level = num_passes >> 1, level + 1
+        for move in self.moves[:remainder]:
+            position = move[position]
+        return position
+
+    def get_first_target(self, start_id: int) -> Optional[int]:
+        """Steps until start_id first sits on a target, None if not reached within the table horizon"""
+        position, num_passes = start_id, 0
+        for level in range(len(self.passes) - 1, -1, -1):
+            if not self.pass_hits[level][position]:
+                position = self.passes[level][position]
+                num_passes += 1 << level
+        if self.first_target[position] < 0:
+            return None
+        return num_passes * len(self.moves) + self.first_target[position]
+
+    def get_positions(self, start_ids: List[int], steps: int) -> List[int]:
+        return [self.get_position(start_id, steps) for start_id in start_ids]
+
+    def get_first_targets(self, start_ids: List[int]) -> List[Optional[int]]:
+        return [self.get_first_target(start_id) for start_id in start_ids]
+
+
+def count_steps(network_input: NetworkInput) -> int:
+    # A single query, so walk the compiled arrays directly rather than paying for a JumpTable over every node
+    step_seq, network_map = network_input
+    names, left, right = compile_network(network_map)
+    moves = [right if step == "R" else left for step in step_seq]
+    position, target = names.index("AAA"), names.index("ZZZ")
+    pass_starts = bytearray(len(names))  # a node repeating at the start of a pass means the walk loops forever
+    steps = 0
+    while not pass_starts[position]:
+        pass_starts[position] = 1
+        for move in moves:
+            if position == target:
+                return steps
+            position = move[position]
+            steps += 1
+    raise ValueError("ZZZ is not reachable from AAA")
+
+
+def get_cycles(
+    step_seq: str, network: CompiledNetwork, start_id: int, pass_visits: Optional[array] = None
+) -> GhostCycle:
+    """Walk full passes of step_seq until a node repeats at the start of a pass, recording Z hits along the way"""
+    names, left, right = network
+    moves = [right if step == "R" else left for step in step_seq]
+    # pass_visits[node] = pass index at which node was seen at the start of a pass, -1 if unseen
+    visits = array("q", [-1]) * len(names) if pass_visits is None else pass_visits
+    seen, z_hits = [], []
+    position, steps, pass_ix = start_id, 0, 0
+    while visits[position] < 0:
+        visits[position] = pass_ix
+        seen.append(position)
+        for move in moves:
+            if names[position][-1] == "Z":
+                z_hits.append(steps)
+            position = move[position]
+            steps += 1
+        pass_ix += 1
+    cycle_start = visits[position] * len(step_seq)
+    for node in seen:  # reset only what we touched so the visit array can be reused across starts
+        visits[node] = -1
+    return cycle_start, steps - cycle_start, z_hits
+
+
+def combine_congruences(cong1: Congruence, cong2: Congruence) -> Optional[Congruence]:
+    """Generalized CRT, moduli need not be coprime. None if the congruences are incompatible"""
+    (res1, mod1), (res2, mod2) = cong1, cong2
+    g = gcd(mod1, mod2)
+    if (res2 - res1) % g:
+        return None
+    lcm_mod = mod1 // g * mod2
+    k = (res2 - res1) // g * pow(mod1 // g, -1, mod2 // g) % (mod2 // g)
+    return (res1 + k * mod1) % lcm_mod, lcm_mod
+
+
+def combine_residue_sets(residue_set1: ResidueSet, residue_set2: ResidueSet) -> ResidueSet:
+    """Residues mod the lcm that are in both sets, pairs that disagree mod the gcd drop out"""
+    (residues1, mod1), (residues2, mod2) = residue_set1, residue_set2
+    residues = {
+        cong[0]
+        for res1, res2 in product(residues1, residues2)
+        if (cong := combine_congruences((res1, mod1), (res2, mod2))) is not None
+    }
+    return residues, lcm(mod1, mod2)
+
+
+def get_min_common_residue(residue_set1: ResidueSet, residue_set2: ResidueSet) -> Optional[int]:
+    """Smallest residue mod the lcm in both sets, without building every common residue"""
+    (residues1, mod1), (residues2, mod2) = residue_set1, residue_set2
+    g = gcd(mod1, mod2)
+    mod2_g = mod2 // g
+    inv = pow(mod1 // g, -1, mod2_g)
+    # res1 + mod1 * k is in both sets for k = (res2 // g - res1 // g) * inv mod mod2_g, if res1 and res2 agree mod g.
+    # Precompute res2 // g * inv per class mod g so the smallest k for each res1 is a bisect away
+    offsets: Dict[int, List[int]] = {}
+    for res2 in residues2:
+        offsets.setdefault(res2 % g, []).append(res2 // g * inv % mod2_g)
+    for res2_offsets in offsets.values():
+        res2_offsets.sort()
+    min_residue = None
+    for res1 in residues1:
+        class_offsets = offsets.get(res1 % g)
+        if class_offsets is None:
+            continue
+        offset1 = res1 // g * inv % mod2_g
+        ix = bisect_left(class_offsets, offset1)
+        k = class_offsets[ix] - offset1 if ix < len(class_offsets) else class_offsets[0] - offset1 + mod2_g
+        if min_residue is None or res1 + mod1 * k < min_residue:
+            min_residue = res1 + mod1 * k
+    return min_residue
+
+
+def is_ghost_hit(steps: int, cycle: GhostCycle) -> bool:
+    cycle_start, period, z_hits = cycle
+    if steps < cycle_start + period:
+        return steps in z_hits
+    return (cycle_start + (steps - cycle_start) % period) in z_hits
+
+
+def get_min_common_hit(cycles: List[GhostCycle]) -> int:
+    # Any answer before every walker has entered its cycle is a Z hit recorded for some walker, check those directly
+    candidates = sorted({hit for cycle in cycles for hit in cycle[2]})
+    last_cycle_start = max(cycle[0] for cycle in cycles)
+    for hit in candidates:
+        if hit >= last_cycle_start:
+            break
+        if all(is_ghost_hit(hit, cycle) for cycle in cycles):
+            return hit
+    # Otherwise every walker is on its cycle, where its Z hits are residues mod its period. Count from
+    # last_cycle_start so the answer is the smallest common residue
+    walker_residues = [
+        ({(hit - last_cycle_start) % period for hit in z_hits if hit >= cycle_start}, period)
+        for cycle_start, period, z_hits in cycles
+    ]
+    # Common residues can number the product of every walker's hit count, so combine each half of the walkers and
+    # only match the halves up for the smallest
+    halves: List[ResidueSet] = [({0}, 1), ({0}, 1)]
+    for residue_set in sorted(walker_residues, key=lambda residue_set: len(residue_set[0]), reverse=True):
+        half_ix = min((0, 1), key=lambda ix: len(halves[ix][0]))
+        halves[half_ix] = combine_residue_sets(halves[half_ix], residue_set)
+    min_residue = get_min_common_residue(*halves)
+    if min_residue is None:
+        raise ValueError("Ghosts never all reach Z positions at the same time")
+    return last_cycle_start + min_residue
+
+
+def count_spooky_ghost_steps(network_input: NetworkInput) -> int:
+    step_seq, network_map = network_input
+    network = compile_network(network_map)
+    pass_visits = array("q", [-1]) * len(network[0])
+    start_ids = [node_id for node_id, name in enumerate(network[0]) if name.endswith("A")]
+    return get_min_common_hit([get_cycles(step_seq, network, start_id, pass_visits) for start_id in start_ids])
+
+
+INPUT_FP = "inputs/day08/main.txt"
+SOLVER = (load_network, count_steps, count_spooky_ghost_steps)
+
+
+def run_tests() -> None:
+    assert count_steps(load_network("inputs/day08/test.txt")) == 2
+    assert count_steps(load_network("inputs/day08/test2.txt")) == 6
+    assert count_spooky_ghost_steps(load_network("inputs/day08/test3.txt")) == 6
+    assert combine_congruences((2, 6), (5, 9)) == (14, 18)
+    assert combine_congruences((1, 6), (2, 9)) is None
+    assert get_min_common_residue(({2, 4}, 6), ({5, 7}, 9)) == 14
+    assert get_min_common_residue(({1}, 6), ({2}, 9)) is None
+    test_step_seq, test_network_map = load_network("inputs/day08/test2.txt")
+    test_network = compile_network(test_network_map)
+    test_jump_table = JumpTable(test_step_seq, test_network, bytes(name == "ZZZ" for name in test_network[0]))
+    assert [test_network[0][pos] for pos in test_jump_table.get_positions([0, 1], 10**12)] == ["ZZZ", "ZZZ"]
+    assert test_network[0][test_jump_table.get_position(0, 5)] == "BBB"
+    assert test_jump_table.get_first_targets([0, 1, 2]) == [6, 3, 0]
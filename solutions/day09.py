@@ -1,32 +1,73 @@
-from typing import List
+from collections import defaultdict
+from functools import lru_cache, partial
+from math import comb
+from operator import mul
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from solutions.puzzle_input import iter_lines, read_ints
 
 
 def load_sequences(input_fp: str) -> List[List[int]]:
-    return [[int(d) for d in line.split()] for line in open(input_fp).read().split("\n")]
+    return [read_ints(line) for line in iter_lines(input_fp)]
+
+
+@lru_cache(maxsize=None)
+def get_extrapolation_weights(seq_len: int, extrap_forward: bool) -> Tuple[int, ...]:
+    # Summing the last entries of the difference triangle is the same as assuming the n-th difference vanishes,
+    # i.e. a_n = sum_k (-1)^(k + 1) C(n, k) a_(n - k). Weights are ordered to line up with the sequence.
+    weights = tuple((-1) ** (seq_len - k + 1) * comb(seq_len, k) for k in range(seq_len))
+    return weights if extrap_forward else weights[::-1]
 
 
 def extrapolate_sequence(sequence: List[int], extrap_forward: bool) -> int:
-    differences = [sequence] if extrap_forward else [sequence[::-1]]
-    cur_seq = differences[0]
-    while set(cur_seq) != {0} and len(cur_seq) > 1:
-        cur_seq = [cur_seq[k + 1] - cur_seq[k] for k in range(len(cur_seq) - 1)]
-        differences.append(cur_seq)
-    exp_val = 0
-    for diff_seq in differences[::-1]:
-        exp_val += diff_seq[-1]
-    return exp_val
+    return sum(map(mul, get_extrapolation_weights(len(sequence), extrap_forward), sequence))
+
+
+def extrapolate_batch(sequences: List[List[int]], extrap_forward: bool) -> List[int]:
+    """Extrapolate a batch of equal length sequences, a matrix-vector product against the shared weights"""
+    weights = get_extrapolation_weights(len(sequences[0]), extrap_forward)
+    return [sum(map(mul, weights, sequence)) for sequence in sequences]
+
+
+def sum_extrapolated_vals(sequences: List[List[int]], extrap_forward: bool = True) -> int:
+    batches: Dict[int, List[List[int]]] = defaultdict(list)
+    for sequence in sequences:
+        batches[len(sequence)].append(sequence)
+    return sum(sum(extrapolate_batch(batch, extrap_forward)) for batch in batches.values())
+
+
+class StreamingExtrapolator:
+    """Online forward extrapolation, keeping only the trailing edge of the difference table (one value per order)"""
+
+    __slots__ = ("max_order", "edge")
+
+    def __init__(self, max_order: Optional[int] = None, observations: Iterable[int] = ()):
+        # Capping the order assumes differences above max_order vanish, bounding memory / work per sample
+        self.max_order = max_order
+        self.edge: List[int] = []
+        for value in observations:
+            self.append(value)
 
+    def append(self, value: int) -> int:
+        for order, prev_edge in enumerate(self.edge):
+            self.edge[order], value = value, value - prev_edge
+        if self.max_order is None or len(self.edge) <= self.max_order:
+            self.edge.append(value)
+        return self.next_value
 
-def sum_extrapolated_vals(input_fp: str, extrap_forward: bool = True) -> int:
-    sequences = load_sequences(input_fp)
-    return sum([extrapolate_sequence(seq, extrap_forward) for seq in sequences])
+    @property
+    def next_value(self) -> int:
+        return sum(self.edge)
 
 
-# Tests
-assert sum_extrapolated_vals("inputs/day09/test.txt") == 114
-assert sum_extrapolated_vals("inputs/day09/test.txt", False) == 2
+INPUT_FP = "inputs/day09/main.txt"
+SOLVER = (load_sequences, sum_extrapolated_vals, partial(sum_extrapolated_vals, extrap_forward=False))
 
 
-# Solutions
-print(f"Part 1: Sum of Extrapolated Vals - {sum_extrapolated_vals('inputs/day09/main.txt')}")
-print(f"Part 2: Sum of Extrapolated Vals - {sum_extrapolated_vals('inputs/day09/main.txt', False)}")
+def run_tests() -> None:
+    test_sequences = load_sequences("inputs/day09/test.txt")
+    assert sum_extrapolated_vals(test_sequences) == 114
+    assert sum_extrapolated_vals(test_sequences, False) == 2
+    assert extrapolate_batch([[10, 13, 16, 21, 30, 45], [1, 3, 6, 10, 15, 21]], False) == [5, 0]
+    assert StreamingExtrapolator(observations=[10, 13, 16, 21, 30]).append(45) == 68
+    assert StreamingExtrapolator(max_order=1, observations=[1, 3, 6, 10, 15]).append(21) == 27
@@ -0,0 +1,256 @@
+"""Deterministic synthetic inputs for every day, at arbitrary scale. Each generator returns the puzzle input text along
+with reference answers for both parts, worked out from how the input was built rather than with the solvers."""
+import random
+import re
+from bisect import bisect_right
+from collections import Counter
+from itertools import product
+from math import lcm
+from typing import Callable, Dict, List, Tuple, TypeAlias
+
+Answers: TypeAlias = Tuple[int, int]
+Generator: TypeAlias = Callable[[random.Random, int], Tuple[str, Answers]]
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+DIGIT_PATTERNS = {word: k + 1 for k, word in enumerate(DIGIT_WORDS)} | {str(d): d for d in range(1, 10)}
+ALMANAC_STAGES = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+CARDS = "AKQJT98765432"
+# Scale means lines for most days, except the grid side for day03 and the node count for day08.
+# Some days can't grow indefinitely: day06 concatenates every race into one number, which has to stay under
+# Python's int <-> str digit limit, and day08 node names are 3 chars.
+MAX_SCALES = {6: 500, 8: 30000}
+
+
+def generate_day01(rng: random.Random, scale: int) -> Tuple[str, Answers]:
+    lines, part1, part2 = [], 0, 0
+    for _ in range(scale):
+        tokens = [rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 20))]
+        tokens += [str(rng.randint(1, 9)) for _ in range(rng.randint(1, 3))]  # at least one explicit digit
+        tokens += [rng.choice(DIGIT_WORDS) for _ in range(rng.randint(0, 3))]
+        rng.shuffle(tokens)
+        line = "".join(tokens)
+        explicit = [int(char) for char in line if char.isdigit()]
+        spelled = [
+            value
+            for ix in range(len(line))
+            for pattern, value in DIGIT_PATTERNS.items()
+            if line.startswith(pattern, ix)
+        ]
+        lines.append(line)
+        part1 += 10 * explicit[0] + explicit[-1]
+        part2 += 10 * spelled[0] + spelled[-1]
+    return "\n".join(lines), (part1, part2)
+
+
+def generate_day02(rng: random.Random, scale: int) -> Tuple[str, Answers]:
+    lines, part1, part2 = [], 0, 0
+    for game_no in range(1, scale + 1):
+        rounds, maxes = [], {"red": 0, "green": 0, "blue": 0}
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(list(maxes), rng.randint(1, 3))
+            counts = [rng.randint(1, 20) for _ in colors]
+            rounds.append(", ".join(f"{count} {color}" for count, color in zip(counts, colors)))
+            for count, color in zip(counts, colors):
+                maxes[color] = max(maxes[color], count)
+        lines.append(f"Game {game_no}: " + "; ".join(rounds))
+        if maxes["red"] <= 12 and maxes["green"] <= 13 and maxes["blue"] <= 14:
+            part1 += game_no
+        part2 += maxes["red"] * maxes["green"] * maxes["blue"]
+    return "\n".join(lines), (part1, part2)
+
+
+def generate_day03(rng: random.Random, scale: int) -> Tuple[str, Answers]:
+    grid = [["."] * scale for _ in range(scale)]
+    for cells in grid:
+        col = rng.randint(0, 4)
+        while col < scale:
+            if rng.random() < 0.6:
+                for k, digit in enumerate(str(rng.randint(1, 999))[: scale - col]):
+                    cells[col + k] = digit
+                col += 5
+            else:
+                cells[col] = rng.choice("*#+$/=%@&-")
+                col += 3
+            col += rng.randint(0, 4)
+    rows = ["".join(cells) for cells in grid]
+    # Brute force references: scan the box around every number, and every gear's box for number ids
+    number_at: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+    part1 = 0
+    for row_ix, row in enumerate(rows):
+        for match in re.finditer(r"\d+", row):
+            number = (row_ix, match.start(), int(match.group()))
+            box = [
+                rows[r][c]
+                for r in range(max(0, row_ix - 1), min(scale, row_ix + 2))
+                for c in range(max(0, match.start() - 1), min(scale, match.end() + 1))
+            ]
+            if any(char != "." and not char.isdigit() for char in box):
+                part1 += number[2]
+            for col in range(match.start(), match.end()):
+                number_at[(row_ix, col)] = number
+    part2 = 0
+    for row_ix, row in enumerate(rows):
+        for col_ix, char in enumerate(row):
+            if char == "*":
+                neighbors = {
+                    number_at[(r, c)]
+                    for r in range(row_ix - 1, row_ix + 2)
+                    for c in range(col_ix - 1, col_ix + 2)
+                    if (r, c) in number_at
+                }
+                if len(neighbors) == 2:
+                    part2 += neighbors.pop()[2] * neighbors.pop()[2]
+    return "\n".join(rows), (part1, part2)
+
+
+def generate_day04(rng: random.Random, scale: int) -> Tuple[str, Answers]:
+    lines, matches = [], []
+    for card_no in range(1, scale + 1):
+        winning_numbers = rng.sample(range(1, 100), 10)
+        card_numbers = rng.sample(range(1, 100), 25)
+        lines.append(
+            f"Card {card_no:>{len(str(scale))}}: "
+            + " ".join(f"{d:>2}" for d in winning_numbers)
+            + " | "
+            + " ".join(f"{d:>2}" for d in card_numbers)
+        )
+        matches.append(len(set(winning_numbers) & set(card_numbers)))
+    copies = [1] * scale
+    for card_ix, num_matches in enumerate(matches):
+        for won_ix in range(card_ix + 1, min(scale, card_ix + 1 + num_matches)):
+            copies[won_ix] += copies[card_ix]
+    return "\n".join(lines), (sum(2 ** (m - 1) for m in matches if m), sum(copies))
+
+
+def generate_day05(rng: random.Random, scale: int) -> Tuple[str, Answers]:
+    seed_nos = [n for _ in range(10) for n in (rng.randint(0, 10**9), rng.randint(1, 500))]
+    paragraphs = ["seeds: " + " ".join(map(str, seed_nos))]
+    stages = []
+    for source, target in zip(ALMANAC_STAGES, ALMANAC_STAGES[1:]):
+        # Non overlapping source ranges cut from [0, 2 * 10^9)
+        cuts = sorted(rng.sample(range(2 * 10**9), 2 * max(1, scale // 7)))
+        rules = [(rng.randint(0, 2 * 10**9), cuts[k], cuts[k + 1] - cuts[k]) for k in range(0, len(cuts), 2)]
+        rng.shuffle(rules)
+        paragraphs.append(f"{source}-to-{target} map:\n" + "\n".join(" ".join(map(str, rule)) for rule in rules))
+        stages.append(sorted((source_start, target_start, length) for target_start, source_start, length in rules))
+    stage_starts = [[rule[0] for rule in rules] for rules in stages]
+
+    def locate(value: int) -> int:
+        for rules, starts in zip(stages, stage_starts):
+            rule_ix = bisect_right(starts, value) - 1
+            if rule_ix >= 0 and value < rules[rule_ix][0] + rules[rule_ix][2]:
+                value = rules[rule_ix][1] + value - rules[rule_ix][0]
+        return value
+
+    # Seed ranges are kept short so every seed can be walked through the stages
+    seeds = [seed for start, length in zip(seed_nos[::2], seed_nos[1::2]) for seed in range(start, start + length)]
+    return "\n\n".join(paragraphs), (min(locate(seed) for seed in seed_nos), min(locate(seed) for seed in seeds))
+
+
+def count_race_wins(duration: int, record: int) -> int:
+    # Distance is increasing in hold time up to duration / 2, binary search the first winning hold time
+    lb, ub = 0, duration // 2 + 1
+    while lb < ub:
+        mid = (lb + ub) // 2
+        if mid * (duration - mid) > record:
+            ub = mid
+        else:
+            lb = mid + 1
+    return max(0, duration - 2 * lb + 1) if lb <= duration // 2 else 0
+
+
+def generate_day06(rng: random.Random, scale: int) -> Tuple[str, Answers]:
+    durations = [rng.randint(10, 9999) for _ in range(scale)]
+    # Records just under the best distance keep every race's win count, and so their product, small
+    records = [(d // 2) * (d - d // 2) - rng.randint(1, 2 * d) for d in durations]
+    width = max(len(str(stat)) for stat in durations + records) + 1
+    text = "Time:    " + "".join(f"{d:>{width}}" for d in durations)
+    text += "\nDistance:" + "".join(f"{r:>{width}}" for r in records)
+    part1 = 1
+    for duration, record in zip(durations, records):
+        part1 *= count_race_wins(duration, record)
+    part2 = count_race_wins(int("".join(map(str, durations))), int("".join(map(str, records))))
+    return text, (part1, part2)
+
+
+def get_hand_order(hand: str, jokers_wild: bool) -> Tuple[List[int], List[int]]:
+    # Brute force the best joker substitution rather than counting jokers into the top card
+    substitutes = CARDS if jokers_wild and "J" in hand else "J"
+    shape = max(sorted(Counter(hand.replace("J", card)).values(), reverse=True) for card in substitutes)
+    rank_order = CARDS.replace("J", "") + "J" if jokers_wild else CARDS
+    return shape, [-rank_order.index(card) for card in hand]
+
+
+def generate_day07(rng: random.Random, scale: int) -> Tuple[str, Answers]:
+    hands = ["".join(rng.choice(CARDS) for _ in range(5)) for _ in range(scale)]
+    bids = [rng.randint(1, 1000) for _ in range(scale)]
+    answers = []
+    for jokers_wild in (False, True):
+        # Equal hands keep their input order, as in the original solution's stable sort
+        ranked = sorted(zip(hands, bids), key=lambda hb: get_hand_order(hb[0], jokers_wild))
+        answers.append(sum((rank + 1) * bid for rank, (_, bid) in enumerate(ranked)))
+    return "\n".join(f"{hand} {bid}" for hand, bid in zip(hands, bids)), (answers[0], answers[1])
+
+
+def generate_day08(rng: random.Random, scale: int) -> Tuple[str, Answers]:
+    step_seq = "".join(rng.choice("LR") for _ in range(rng.randint(50, 300)))
+    alphabet = "BCDEFGHIJKLMNOPQRSTUVWXY0123456789"
+    names = ["".join(name) for name in product(alphabet, repeat=3)]
+    rng.shuffle(names)
+    network: Dict[str, Tuple[str, str]] = {}
+    # AAA walks a chain straight to ZZZ, which loops on itself
+    path_len = max(1, scale // 10)
+    chain = ["AAA"] + names[: path_len - 1] + ["ZZZ"]
+    names = names[path_len - 1 :]
+    for node, next_node in zip(chain, chain[1:]):
+        network[node] = (next_node, next_node)
+    network["ZZZ"] = ("ZZZ", "ZZZ")
+    # Ghosts walk a lead-in chain to their Z, which loops back to the start of the chain, so they hit Z every period
+    periods = [rng.randint(max(2, scale // 20), max(3, scale // 10)) for _ in range(4)]
+    for ghost_ix, period in enumerate(periods):
+        ghost = alphabet[ghost_ix] * 2
+        cycle, names = names[: period - 1], names[period - 1 :]
+        ghost_chain = [ghost + "A"] + cycle + [ghost + "Z"]
+        for node, next_node in zip(ghost_chain, ghost_chain[1:]):
+            network[node] = (next_node, next_node)
+        network[ghost + "Z"] = (ghost_chain[1], ghost_chain[1]) if cycle else (ghost + "Z", ghost + "Z")
+    filler = names[: max(0, scale - len(network))]
+    for node in filler:
+        network[node] = (rng.choice(filler), rng.choice(filler))
+    rows = [f"{node} = ({left}, {right})" for node, (left, right) in network.items()]
+    rng.shuffle(rows)
+    # AAA is also a ghost start, hitting Z on every step from path_len on
+    ghost_period = lcm(*periods)
+    part2 = -(-path_len // ghost_period) * ghost_period
+    return step_seq + "\n\n" + "\n".join(rows), (path_len, part2)
+
+
+def generate_day09(rng: random.Random, scale: int) -> Tuple[str, Answers]:
+    lines, part1, part2 = [], 0, 0
+    for _ in range(scale):
+        coefficients = [rng.randint(-20, 20) for _ in range(rng.randint(1, 7))]
+
+        def poly(x: int) -> int:
+            return sum(coef * x**power for power, coef in enumerate(coefficients))
+
+        lines.append(" ".join(str(poly(x)) for x in range(21)))
+        part1 += poly(21)
+        part2 += poly(-1)
+    return "\n".join(lines), (part1, part2)
+
+
+GENERATORS: Dict[int, Generator] = {
+    1: generate_day01,
+    2: generate_day02,
+    3: generate_day03,
+    4: generate_day04,
+    5: generate_day05,
+    6: generate_day06,
+    7: generate_day07,
+    8: generate_day08,
+    9: generate_day09,
+}
+
+
+def generate_input(day: int, scale: int, seed: int = 2023) -> Tuple[str, Answers]:
+    return GENERATORS[day](random.Random(f"{day}-{scale}-{seed}"), min(scale, MAX_SCALES.get(day, scale)))
@@ -0,0 +1,176 @@
+"""Opt-in instrumentation for the solvers. Each day's parse / part phases and its hot path functions are wrapped at
+runtime (no solver edits) to record call counts, wall time, CPU time and tracemalloc peak memory. A background stack
+sampler can also be run, producing collapsed stacks ready for flamegraph.pl / speedscope.
+
+    python -m solutions 8 --profile profile.json --sample stacks.folded
+
+or set AOC_PROFILE / AOC_PROFILE_SAMPLES to those paths to switch it on for any run of the CLI.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeAlias
+
+from solutions import load_day
+
+Labeller: TypeAlias = Optional[Callable[..., str]]
+
+# Functions worth timing per day, with an optional labeller to split stats by argument (e.g. per start node). These
+# are looked up as module globals by the SOLVER functions, SOLVER members themselves are timed as the phases.
+HOT_PATHS: Dict[int, Dict[str, Labeller]] = {
+    1: {"calculate_calibration_values": None, "get_calibration_value": None},
+    2: {"parse_game_lines": None, "get_valid_games_per_config": None, "min_color_set_powers": None},
+    3: {
+        "load_grid": None,
+        "get_symbol_adjacency_mask": None,
+        "label_number_runs": None,
+        "implement_schematic": lambda schematic, return_type="part_nos": return_type,
+    },
+    4: {"load_game_lines": None, "get_match_counts": None, "count_winning_points": None, "cascade_scratchcards": None},
+    5: {
+        "load_almanac_map": None,
+        "compile_almanac_map": None,
+        "get_stage_map": None,
+        "compose_maps": None,
+        "get_location_intervals": None,
+    },
+    6: {"get_winning_time_counts": None, "get_no_winning_times": None, "fix_race_stat": None},
+    7: {"get_hand_arrays": None, "get_hand_key": None, "get_hand_strength": None, "get_array_winnings": None},
+    8: {
+        "get_network_map": None,
+        "compile_network": None,
+        "get_cycles": lambda step_seq, network, start_id, *args: f"start={network[0][start_id]}",
+        "get_min_common_hit": None,
+        "combine_residue_sets": None,
+        "get_min_common_residue": None,
+    },
+    9: {"read_ints": None, "extrapolate_batch": None, "get_extrapolation_weights": None},
+}
+PHASES = ("parse", "part1", "part2")
+
+
+class PhaseStats:
+    __slots__ = ("calls", "wall_s", "cpu_s", "peak_bytes")
+
+    def __init__(self) -> None:
+        self.calls, self.wall_s, self.cpu_s, self.peak_bytes = 0, 0.0, 0.0, 0
+
+
+class Profiler:
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.stats: Dict[Tuple[str, Optional[str]], PhaseStats] = {}
+        self._peak_stack: List[int] = []  # highest traced memory seen inside each active wrapped call
+
+    def wrap(self, name: str, func: Callable[..., Any], labeller: Labeller = None) -> Callable[..., Any]:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            stats = self.stats.setdefault((name, labeller(*args, **kwargs) if labeller else None), PhaseStats())
+            tracing = self.track_memory and tracemalloc.is_tracing()
+            if tracing:
+                # reset_peak is global, so hand the peak seen so far up to the enclosing call before resetting
+                start_bytes, outer_peak = tracemalloc.get_traced_memory()
+                if self._peak_stack:
+                    self._peak_stack[-1] = max(self._peak_stack[-1], outer_peak)
+                tracemalloc.reset_peak()
+                self._peak_stack.append(start_bytes)
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.calls += 1
+                stats.wall_s += time.perf_counter() - wall_start
+                stats.cpu_s += time.process_time() - cpu_start
+                if tracing:
+                    peak = max(self._peak_stack.pop(), tracemalloc.get_traced_memory()[1])
+                    stats.peak_bytes = max(stats.peak_bytes, peak - start_bytes)
+                    if self._peak_stack:
+                        self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+
+        return wrapper
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": name,
+                "label": label,
+                "calls": stats.calls,
+                "wall_s": stats.wall_s,
+                "cpu_s": stats.cpu_s,
+                "peak_bytes": stats.peak_bytes if self.track_memory else None,
+            }
+            for (name, label), stats in self.stats.items()
+        ]
+
+
+@contextmanager
+def instrument(day: int, module: ModuleType, profiler: Profiler) -> Iterator[ModuleType]:
+    """Patch the day's hot path functions and SOLVER phases with profiled wrappers, restoring them afterwards"""
+    originals = {name: getattr(module, name) for name in list(HOT_PATHS.get(day, {})) + ["SOLVER"]}
+    for name, labeller in HOT_PATHS.get(day, {}).items():
+        # Solvers look these up as module globals at call time, so internal calls hit the wrappers too
+        setattr(module, name, profiler.wrap(name, originals[name], labeller))
+    setattr(module, "SOLVER", tuple(profiler.wrap(phase, func) for phase, func in zip(PHASES, originals["SOLVER"])))
+    started_tracing = profiler.track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        yield module
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        for name, func in originals.items():
+            setattr(module, name, func)
+
+
+class StackSampler:
+    """Samples the main thread's Python stack every interval seconds, counting identical stacks"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stack_counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        thread_id = threading.main_thread().ident
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)  # type: ignore[arg-type]
+            stack = []
+            while frame is not None:
+                stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            self.stack_counts[";".join(reversed(stack))] += 1
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed_stacks(self) -> List[str]:
+        return [f"{stack} {count}" for stack, count in self.stack_counts.most_common()]
+
+
+def run_tests() -> None:
+    for day, hot_paths in HOT_PATHS.items():
+        module = load_day(day)
+        solver_funcs = [getattr(func, "func", func) for func in module.SOLVER]  # unwrap partials
+        # Wrapping a SOLVER member's global would never be seen, the phases hold the original function
+        assert not [name for name in hot_paths if getattr(module, name) in solver_funcs], day
+    profiler = Profiler()
+    with instrument(7, load_day(7), profiler) as day07:
+        parse, part1, part2 = day07.SOLVER
+        hands = parse("inputs/day07/test.txt")
+        assert (part1(hands), part2(hands)) == (6440, 5905)
+    calls = {name: stats.calls for (name, _), stats in profiler.stats.items()}
+    assert calls["parse"] == calls["part1"] == calls["part2"] == 1
+    assert calls["get_hand_arrays"] == 2 and calls["get_hand_key"] == 10
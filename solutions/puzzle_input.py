@@ -0,0 +1,57 @@
+"""Shared puzzle input access. Inputs are memory-mapped and read as bytes, lines and paragraphs are produced lazily
+so no loader holds the whole file twice, and every file handle is closed once iteration finishes."""
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple, Union
+
+INT_PATTERN = re.compile(rb"-?\d+")
+
+
+@contextmanager
+def map_input(input_fp: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    with open(input_fp, "rb") as input_file:
+        if os.fstat(input_file.fileno()).st_size == 0:
+            yield b""  # empty files can't be memory-mapped
+            return
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_input:
+            yield mapped_input
+
+
+def iter_split(input_fp: str, delimiter: bytes, start: int = 0, stop: Optional[int] = None) -> Iterator[bytes]:
+    with map_input(input_fp) as mapped_input:
+        stop = len(mapped_input) if stop is None else stop
+        while start < stop:
+            end = mapped_input.find(delimiter, start, stop)
+            if end < 0:
+                end = stop
+            yield mapped_input[start:end]
+            start = end + len(delimiter)
+
+
+def iter_lines(input_fp: str, start: int = 0, stop: Optional[int] = None) -> Iterator[bytes]:
+    """Lines of the input, optionally only those in the byte range [start, stop)"""
+    return iter_split(input_fp, b"\n", start, stop)
+
+
+def get_line_chunks(input_fp: str, chunk_bytes: int) -> List[Tuple[int, int]]:
+    # Byte ranges of roughly chunk_bytes each, extended so every range ends on a line boundary
+    chunks = []
+    with map_input(input_fp) as mapped_input:
+        start = 0
+        while start < len(mapped_input):
+            end = mapped_input.find(b"\n", min(len(mapped_input), start + chunk_bytes) - 1)
+            end = len(mapped_input) if end < 0 else end + 1
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def iter_paragraphs(input_fp: str) -> Iterator[bytes]:
+    # Blank line delimited blocks, e.g. the almanac maps of day05 or the instructions / network of day08
+    return (paragraph.rstrip(b"\n") for paragraph in iter_split(input_fp, b"\n\n"))
+
+
+def read_ints(field: bytes) -> List[int]:
+    return [int(token) for token in INT_PATTERN.findall(field)]
@@ -0,0 +1,333 @@
+"""Long running query server keeping parsed inputs (and indexes built on them) warm between requests.
+
+    python -m solutions.server --port 2023 --preload 5 8:inputs/day08/main.txt    # or --socket /tmp/aoc.sock
+
+Clients send one JSON request per line over a connection and get one JSON response per line back, in order:
+
+    {"id": 1, "day": 5, "query": "seed_locations", "args": {"seeds": [79, 14]}}
+    {"id": 1, "result": [82, 43], "latency_ms": 0.02}
+
+Datasets are keyed by day and input path (defaulting to the day's puzzle input), parsed on first use off the event loop
+and reparsed if the file changes. Every day answers part1 / part2, QUERIES and STATELESS_QUERIES list the day specific
+queries, and {"query": "metrics"} reports latency stats per query. Queries run in worker threads off the event loop.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeAlias
+
+from solutions import DAYS, Solver, load_day
+from solutions.day05 import get_min_seed_location, get_seed_location
+from solutions.day07 import get_raw_hand_winnings
+from solutions.day08 import JumpTable, compile_network
+
+Handler: TypeAlias = Callable[["Dataset", Dict[str, Any]], Any]
+DEFAULT_PORT = 2023
+LATENCY_WINDOW = 1024  # recent latencies kept per query for percentiles
+MAX_REQUEST_BYTES = 1 << 24
+
+
+def get_resident_solver(day: int) -> Solver:
+    # Days whose one off SOLVER doesn't suit a long lived dataset (e.g. day07's mutable HandStream) offer STREAM_SOLVER
+    module = load_day(day)
+    return getattr(module, "STREAM_SOLVER", module.SOLVER)
+
+
+class Dataset:
+    """A day's parsed input, with answers and indexes built on it so far"""
+
+    __slots__ = ("day", "input_fp", "mtime", "parsed", "answers", "indexes", "building", "lock")
+
+    def __init__(self, day: int, input_fp: str):
+        self.day, self.input_fp = day, input_fp
+        self.mtime = os.stat(input_fp).st_mtime_ns
+        self.parsed = get_resident_solver(day)[0](input_fp)
+        self.answers: Dict[int, int] = {}
+        self.indexes: Dict[Any, Any] = {}
+        self.building: Dict[Any, threading.Lock] = {}  # index key -> lock held while that index builds
+        self.lock = threading.RLock()  # queries run in worker threads, guards lazily built and mutable state
+        if day in WARMERS:
+            WARMERS[day](self)
+
+    def get_index(self, key: Any, build: Callable[[], Any]) -> Any:
+        # Build outside the dataset lock so other queries keep going, only queries for the same index wait on it
+        with self.lock:
+            if key in self.indexes:
+                return self.indexes[key]
+            build_lock = self.building.setdefault(key, threading.Lock())
+        with build_lock:
+            with self.lock:
+                if key in self.indexes:
+                    return self.indexes[key]
+            index = build()
+            with self.lock:
+                self.indexes[key] = index
+                del self.building[key]
+            return index
+
+    def get_answer(self, part: int) -> int:
+        with self.lock:
+            if part not in self.answers:
+                self.answers[part] = get_resident_solver(self.day)[part](self.parsed)
+            return self.answers[part]
+
+
+def get_seed_ranges(args: Dict[str, Any]) -> List[Tuple[int, int]]:
+    # Ranges are given as in the almanac, [start, length]
+    return [(start, start + length - 1) for start, length in args["seed_ranges"] if length > 0]
+
+
+def get_jump_table(dataset: Dataset, target: str) -> JumpTable:
+    """Jump table towards every node whose name ends with target, built on first use of each target"""
+    step_seq, _ = dataset.parsed
+    names = dataset.indexes["network"][0]
+    return dataset.get_index(
+        ("jumps", target),
+        lambda: JumpTable(step_seq, dataset.indexes["network"], bytes(name.endswith(target) for name in names)),
+    )
+
+
+def get_node_ids(dataset: Dataset, starts: List[str]) -> List[int]:
+    node_ids = dataset.indexes["node_ids"]
+    missing = [start for start in starts if start not in node_ids]
+    if missing:
+        raise ValueError(f"Unknown nodes {missing}")
+    return [node_ids[start] for start in starts]
+
+
+def get_hand_set_winnings(args: Dict[str, Any]) -> int:
+    # Same key sort as the CLI, so equal hands rank in the order given
+    return get_raw_hand_winnings([(hand, bid) for hand, bid in args["hands"]], args.get("jokers_wild", False))
+
+
+def get_hand_stream_winnings(dataset: Dataset, args: Dict[str, Any]) -> int:
+    with dataset.lock:
+        return dataset.parsed.get_winnings(args.get("jokers_wild", False))
+
+
+def update_hand_stream(dataset: Dataset, args: Dict[str, Any], insert: bool) -> Dict[str, Any]:
+    """Insert [hand, bid] pairs, or remove them given as [hand, bid] or [hand, bid, seq] from the insert's seqs"""
+    with dataset.lock:
+        dataset.answers.clear()
+        updated: Dict[str, Any] = {}
+        if insert:
+            updated["seqs"] = [dataset.parsed.insert(hand, bid) for hand, bid in args["hands"]]
+        else:
+            for hand, bid, *seq in args["hands"]:
+                dataset.parsed.remove(hand, bid, *seq)
+        updated["winnings"] = dataset.parsed.get_winnings()
+        updated["wild_winnings"] = dataset.parsed.get_winnings(True)
+        return updated
+
+
+def warm_network(dataset: Dataset) -> None:
+    network = compile_network(dataset.parsed[1])
+    dataset.indexes["network"] = network
+    dataset.indexes["node_ids"] = {name: k for k, name in enumerate(network[0])}
+    get_jump_table(dataset, "ZZZ")
+
+
+# Structures built as soon as a day's input is parsed, so the first query doesn't pay for them
+WARMERS: Dict[int, Callable[[Dataset], None]] = {8: warm_network}
+
+PART_QUERIES: Dict[str, Handler] = {
+    "part1": lambda dataset, args: dataset.get_answer(1),
+    "part2": lambda dataset, args: dataset.get_answer(2),
+}
+
+# Answered from the request's args alone, without loading the day's input
+STATELESS_QUERIES: Dict[int, Dict[str, Callable[[Dict[str, Any]], Any]]] = {
+    7: {"hand_set_winnings": get_hand_set_winnings}
+}
+
+QUERIES: Dict[int, Dict[str, Handler]] = {
+    5: {
+        "seed_locations": lambda dataset, args: [get_seed_location(seed, dataset.parsed[2]) for seed in args["seeds"]],
+        "min_location": lambda dataset, args: get_min_seed_location(get_seed_ranges(args), dataset.parsed[2]),
+    },
+    7: {
+        "winnings": get_hand_stream_winnings,
+        "insert": lambda dataset, args: update_hand_stream(dataset, args, insert=True),
+        "remove": lambda dataset, args: update_hand_stream(dataset, args, insert=False),
+    },
+    8: {
+        # Steps until each start first reaches a node ending with target, null if never
+        "steps": lambda dataset, args: get_jump_table(dataset, args.get("target", "ZZZ")).get_first_targets(
+            get_node_ids(dataset, args["starts"])
+        ),
+        "positions": lambda dataset, args: [
+            dataset.indexes["network"][0][position]
+            for position in get_jump_table(dataset, "ZZZ").get_positions(
+                get_node_ids(dataset, args["starts"]), args["steps"]
+            )
+        ],
+    },
+}
+
+
+class QueryMetrics:
+    """Per query counts, errors and latencies, with percentiles over a window of recent calls"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self.counts: Dict[str, List[int]] = {}  # query -> [calls, errors]
+        self.total_s: Dict[str, float] = {}
+        self.max_s: Dict[str, float] = {}
+        self.recent_s: Dict[str, Deque[float]] = {}
+
+    def record(self, query: str, latency_s: float, ok: bool = True) -> None:
+        if query not in self.counts:
+            self.counts[query], self.total_s[query], self.max_s[query] = [0, 0], 0.0, 0.0
+            self.recent_s[query] = deque(maxlen=self.window)
+        self.counts[query][0] += 1
+        self.counts[query][1] += not ok
+        self.total_s[query] += latency_s
+        self.max_s[query] = max(self.max_s[query], latency_s)
+        self.recent_s[query].append(latency_s)
+
+    def to_json(self) -> Dict[str, Dict[str, Any]]:
+        metrics = {}
+        for query, (calls, errors) in self.counts.items():
+            recent = sorted(self.recent_s[query])
+            metrics[query] = {
+                "calls": calls,
+                "errors": errors,
+                "mean_ms": 1e3 * self.total_s[query] / calls,
+                "p50_ms": 1e3 * recent[len(recent) // 2],
+                "p99_ms": 1e3 * recent[min(len(recent) - 1, len(recent) * 99 // 100)],
+                "max_ms": 1e3 * self.max_s[query],
+            }
+        return metrics
+
+
+class QueryServer:
+    def __init__(self) -> None:
+        self.datasets: Dict[Tuple[int, str], Dataset] = {}
+        self.loading: Dict[Tuple[int, str], "asyncio.Future[Dataset]"] = {}
+        self.metrics = QueryMetrics()
+
+    async def get_dataset(self, day: int, input_fp: str) -> Dataset:
+        key = (day, os.path.realpath(input_fp))
+        cached = self.datasets.get(key)
+        if cached is not None and cached.mtime == os.stat(input_fp).st_mtime_ns:
+            return cached
+        if key not in self.loading:
+            # Parse in a worker thread so other clients keep being served, concurrent requests share the one load
+            self.loading[key] = asyncio.ensure_future(asyncio.to_thread(Dataset, day, input_fp))
+        load = self.loading[key]
+        try:
+            dataset = await asyncio.shield(load)  # a client hanging up mustn't cancel everyone else's load
+        finally:
+            if self.loading.get(key) is load and load.done():
+                del self.loading[key]
+        self.datasets[key] = dataset
+        return dataset
+
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        query = str(request.get("query"))
+        metric_name = query
+        response: Dict[str, Any] = {"id": request.get("id")}
+        try:
+            if query == "metrics":
+                response["result"] = self.metrics.to_json()
+            elif query == "datasets":
+                response["result"] = [{"day": day, "input": input_fp} for day, input_fp in self.datasets]
+            else:
+                day = request["day"]
+                module = load_day(day)
+                metric_name = f"day{day:02d}.{query}"
+                args = request.get("args", {})
+                # Handlers run in worker threads so a slow query (e.g. a new day08 jump table) doesn't hold up others
+                if query in STATELESS_QUERIES.get(day, {}):
+                    response["result"] = await asyncio.to_thread(STATELESS_QUERIES[day][query], args)
+                else:
+                    handler = QUERIES.get(day, {}).get(query) or PART_QUERIES.get(query)
+                    if handler is None:
+                        raise ValueError(f"Unknown query {query} for day {day}")
+                    dataset = await self.get_dataset(day, request.get("input") or module.INPUT_FP)
+                    response["result"] = await asyncio.to_thread(handler, dataset, args)
+        except Exception as exc:  # bad queries and inputs are reported back, the connection stays usable
+            response["error"] = f"{type(exc).__name__}: {exc}"
+        latency_s = time.perf_counter() - start
+        self.metrics.record(metric_name, latency_s, ok="error" not in response)
+        response["latency_ms"] = 1e3 * latency_s
+        return response
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    response: Dict[str, Any] = {"id": None, "error": f"Invalid JSON: {exc}"}
+                else:
+                    if isinstance(request, dict):
+                        response = await self.handle_request(request)
+                    else:
+                        response = {"id": None, "error": "Requests must be JSON objects"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # client went away or sent an oversized line, drop just this connection
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, socket_path: Optional[str] = None) -> None:
+        if socket_path:
+            server = await asyncio.start_unix_server(self.serve_client, socket_path, limit=MAX_REQUEST_BYTES)
+        else:
+            server = await asyncio.start_server(self.serve_client, host, port, limit=MAX_REQUEST_BYTES)
+        async with server:
+            await server.serve_forever()
+
+
+def query_server(
+    requests: List[Dict[str, Any]], host: str = "127.0.0.1", port: int = DEFAULT_PORT, socket_path: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Blocking client, sends requests over one connection and returns their responses"""
+    if socket_path:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+    else:
+        conn = socket.create_connection((host, port))
+    with conn, conn.makefile("rwb") as stream:
+        for request in requests:
+            stream.write(json.dumps(request).encode() + b"\n")
+        stream.flush()
+        return [json.loads(stream.readline()) for _ in requests]
+
+
+async def run_server(
+    preload: List[Tuple[int, Optional[str]]], host: str, port: int, socket_path: Optional[str]
+) -> None:
+    server = QueryServer()
+    for day, input_fp in preload:
+        await server.get_dataset(day, input_fp or load_day(day).INPUT_FP)
+    await server.serve(host, port, socket_path)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m solutions.server", description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--preload", nargs="+", default=[], metavar="DAY[:PATH]", help="Inputs to parse at startup")
+    args = parser.parse_args(argv)
+
+    preload = []
+    for spec in args.preload:
+        day, _, input_fp = spec.partition(":")
+        if int(day) not in DAYS:
+            parser.error(f"No solution for day {day}")
+        preload.append((int(day), input_fp or None))
+    asyncio.run(run_server(preload, args.host, args.port, args.socket))
+
+
+if __name__ == "__main__":
+    main()